@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import calendar
 import datetime as dt
+import functools
+from collections.abc import Iterable
 
 import jpholiday
 
@@ -13,7 +15,9 @@ WEEKDAY_LIST = list(Weekday)
 # 指定年・月の全日付を生成
 def generate_monthly_dates(year: int, month: int) -> list[dt.date]:
     _, ndays = calendar.monthrange(year, month)
-    return [dt.date(year, month, day) for day in range(1, ndays + 1)]
+    # 月初の序数から連番で作る(日ごとの年月日チェックを省く)
+    first = dt.date(year, month, 1).toordinal()
+    return list(map(dt.date.fromordinal, range(first, first + ndays)))
 
 
 # 曜日判定
@@ -26,16 +30,19 @@ def _is_weekend(d: dt.date) -> bool:
     return d.weekday() >= 5  # 5=Sat, 6=Sun
 
 
+@functools.cache
 def is_public_holiday(d: dt.date) -> bool:
     """平日の祝日かどうか(= 祝日 かつ 土日ではない)"""
-    return is_holiday_or_weekend(d) and not _is_weekend(d)
+    return not _is_weekend(d) and (jpholiday.is_holiday(d) or _is_year_end_new_year(d))
 
 
+@functools.cache
 def is_holiday_or_weekend(d: dt.date) -> bool:
     """土日祝いずれかに該当するか"""
     return _is_weekend(d) or jpholiday.is_holiday(d) or _is_year_end_new_year(d)
 
 
+@functools.cache
 def is_last_holiday(d: dt.date) -> bool:
     """
     2日以上連続した『土日祝』の並びの最終日か?
@@ -63,3 +70,13 @@ def _is_year_end_new_year(d: dt.date) -> bool:
     new_year_end = dt.date(d.year, 1, 3)
 
     return (year_end_start <= d <= year_end_end) or (new_year_start <= d <= new_year_end)
+
+
+def holidays_in(days: Iterable[dt.date]) -> frozenset[dt.date]:
+    """days のうち土日祝に該当する日の集合"""
+    return frozenset(d for d in days if is_holiday_or_weekend(d))
+
+
+def last_holidays_in(days: Iterable[dt.date]) -> frozenset[dt.date]:
+    """days のうち連休(土日祝の2日以上の並び)の最終日に該当する日の集合"""
+    return frozenset(d for d in days if is_last_holiday(d))
@@ -10,18 +10,20 @@ from rich.console import Console
 from rich.table import Table
 
 from src import __version__
-from src.calendar.utils import generate_monthly_dates
+from src.calendar.utils import (
+    generate_monthly_dates,
+    holidays_in,
+    last_holidays_in,
+)
 from src.constraints.autoimport import auto_import_all
 from src.constraints.base import all_constraints
-from src.domain.context import Context
-from src.domain.types import Weekday
+from src.domain.context import Context, build_day_index, build_var_index
 from src.io.export_excel import export_schedule_to_excel
 from src.io.hospitals_loader import load_hospitals
 from src.io.max_assignments_loader import load_max_assignments_csv
 from src.io.preferences_loader import load_preferences_csv
 from src.io.specified_days_loader import load_specified_days
 from src.io.workers_loader import load_workers
-from src.model.demand import compute_required_hd
 from src.model.variable_builder import VariableBuilder
 from src.optimizer.objective import set_two_stage_objective
 from src.optimizer.penalty_report import print_penalties_rich
@@ -56,12 +58,11 @@ def build_and_solve(
 
     # 2) 変数生成
     vb = VariableBuilder(hospitals=hospitals, workers=workers, days=days)
-    vb.init_all_zero()
     vb.elevate_by_workers(workers)
     vb.restrict_by_hospitals(hospitals, specified_days)
     vb.filter_by_max_assignments(max_assignments)
     x = vb.materialize(name="x")
-    required_hd = compute_required_hd(hospitals, days, list(Weekday), specified_days)
+    required_hd = set(vb.required_map_for(hospitals, specified_days))
 
     # 3) モデル&ctx
     model = pulp.LpProblem(f"duty_{year}_{month:02d}", pulp.LpMinimize)
@@ -74,7 +75,11 @@ def build_and_solve(
         max_assignments=max_assignments,
         required_hd=required_hd,
         variables=x,
+        holidays=holidays_in(days),
+        last_holidays=last_holidays_in(days),
     )
+    build_var_index(ctx, x)
+    build_day_index(ctx)
 
     # 4) 制約適用
     auto_import_all()  # constraints 配下のモジュールを全て import して登録
@@ -124,7 +129,7 @@ def print_report_rich(res: SolveResult) -> None:
         console.rule("⚠️  [bold red]Staff Shortage Detected")
         shortage_table = Table("Date", "Hospital", "Shortage", style="red")
         for (hospital, d), shortage in sorted(res.shortage_slack.items()):
-            shortage_table.add_row(d.isoformat(), hospital, f"{int(shortage)} person(s)")
+            shortage_table.add_row(d.isoformat(), hospital, f"{round(shortage)} person(s)")
         console.print(shortage_table)
 
     if res.penalty_by_source:
@@ -1,9 +1,15 @@
 import importlib
 import pkgutil
 
+_done = False  # 一度走査したら以降はスキップする
+
 
 def auto_import_all() -> None:
     # この関数を呼ぶと constraints パッケージ配下のモジュールを全て import
+    global _done
+    if _done:
+        return
+
     from . import __path__ as pkg_path  # constraints パッケージの検索パス
 
     for m in pkgutil.iter_modules(pkg_path):
@@ -14,3 +20,4 @@ def auto_import_all() -> None:
         if name in {"base", "base_impl", "autoimport"}:
             continue
         importlib.import_module(f"src.constraints.{name}")
+    _done = True
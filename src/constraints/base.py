@@ -1,12 +1,13 @@
 # プラグイン化の基底プログラム
 from src.constraints.base_impl import ConstraintBase
 
-constraint_registry = []  # 登録された制約条件のリスト
+# 登録された制約条件(name -> 制約)。同名の再登録は上書きされる
+constraint_registry: dict[str, ConstraintBase] = {}
 
 
 def register(constraint: ConstraintBase) -> None:
-    constraint_registry.append(constraint)
+    constraint_registry[constraint.name] = constraint
 
 
 def all_constraints() -> list[ConstraintBase]:
-    return list(constraint_registry)
+    return list(constraint_registry.values())
@@ -1,14 +1,14 @@
-from collections import defaultdict
 from collections.abc import Mapping
 from datetime import date
 from typing import ClassVar, override
 
 import pulp
 
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_var_index
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_sum_constraint
 
 
 class OnePersonPerHospital(ConstraintBase):
@@ -23,17 +23,25 @@ class OnePersonPerHospital(ConstraintBase):
         self.ensure_requires(ctx)
         # 各病院が必要な (病院, 日) ごとに、1人だけ割り当てる。
         required_hd = ctx["required_hd"]  # set((h,d), ...)
-        by_hd = defaultdict(list)
-        for (h, _, d, _), var in x.items():
-            by_hd[(h, d)].append(var)
+        ensure_var_index(ctx, x)
+        by_hd = ctx["by_hd"]
 
         slack_map: dict[tuple[str, date], pulp.LpVariable] = ctx.setdefault("shortage_slack", {})
 
         for h, d in required_hd:
             vars_hd = by_hd.get((h, d), [])
-            s = pulp.LpVariable(f"s_short_{h}_{d.strftime('%Y%m%d')}", lowBound=0, cat="Binary")
+            # Σvars(二値) + s == 1 なので s は整数制約なしでも 0/1 に決まる
+            s = pulp.LpVariable(
+                f"s_short_{h}_{d.strftime('%Y%m%d')}", lowBound=0, upBound=1, cat="Continuous"
+            )
             slack_map[(h, d)] = s
-            model += pulp.lpSum(vars_hd) + s == 1, f"one_person_{h}_{d.strftime('%Y%m%d')}"
+            add_sum_constraint(
+                model,
+                [*vars_hd, s],
+                pulp.LpConstraintEQ,
+                1,
+                f"one_person_{h}_{d.strftime('%Y%m%d')}",
+            )
 
 
 register(OnePersonPerHospital())
@@ -1,15 +1,17 @@
+import itertools
 from collections import defaultdict
 from collections.abc import Mapping
 from typing import ClassVar, override
 
 import pulp
 
-from src.calendar.utils import is_holiday_or_weekend
-from src.domain.context import Context, VarKey
+from src.calendar.utils import holidays_in
+from src.domain.context import Context, VarKey, ensure_var_index
 from src.domain.types import ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_sum_constraint
 
 
 class NoOverlapSameTimeAcrossHospitals(ConstraintBase):
@@ -30,63 +32,52 @@ class NoOverlapSameTimeAcrossHospitals(ConstraintBase):
         self, model: pulp.LpProblem, x: Mapping[VarKey, pulp.LpVariable], ctx: Context
     ) -> None:
         # (w, d) ごとにまとめる
-        by_wd = defaultdict(list)
-        for (_h, w, d, s), var in x.items():
-            by_wd[(w, d)].append((s, var))
-
-        for (w, d), entries in by_wd.items():
+        ensure_var_index(ctx, x)
+        holidays = ctx.get("holidays")
+        if holidays is None:
+            holidays = holidays_in(d for (_w, d) in ctx["by_wd"])
+        empty: list[pulp.LpVariable] = []
+        for (w, d), entries in ctx["by_wd"].items():
+            # 変数が1つだけなら ≤ 1 は自明なので行を作らない
+            if len(entries) < 2:
+                continue
             vars_by_shift = defaultdict(list)
-            for s, var in entries:
+            for _h, s, var in entries:
                 vars_by_shift[s].append(var)
+            ymd = d.strftime("%Y%m%d")
 
             # 1) 同一シフトの重複禁止
             for s, vars_s in vars_by_shift.items():
-                if vars_s:
-                    model += (
-                        pulp.lpSum(vars_s) <= 1,
-                        f"no_overlap_same_{s.name}_{w}_{d.strftime('%Y%m%d')}",
+                if len(vars_s) > 1:
+                    add_sum_constraint(
+                        model,
+                        vars_s,
+                        pulp.LpConstraintLE,
+                        1,
+                        f"no_overlap_same_{s.name}_{w}_{ymd}",
                     )
 
-            # 2) DAY-AM
-            day_am = vars_by_shift.get(ShiftType.DAY, []) + vars_by_shift.get(ShiftType.AM, [])
-            if day_am:
-                model += (
-                    pulp.lpSum(day_am) <= 1,
-                    f"no_overlap_DAY_AM_{w}_{d.strftime('%Y%m%d')}",
-                )
-
-            # 3) DAY-PM
-            day_pm = vars_by_shift.get(ShiftType.DAY, []) + vars_by_shift.get(ShiftType.PM, [])
-            if day_pm:
-                model += (
-                    pulp.lpSum(day_pm) <= 1,
-                    f"no_overlap_DAY_PM_{w}_{d.strftime('%Y%m%d')}",
-                )
-            # 4) 休日のNIGHTと他シフトの重複禁止
-            if is_holiday_or_weekend(d):
-                night_day = vars_by_shift.get(ShiftType.NIGHT, []) + vars_by_shift.get(
-                    ShiftType.DAY, []
-                )
-                night_am = vars_by_shift.get(ShiftType.NIGHT, []) + vars_by_shift.get(
-                    ShiftType.AM, []
-                )
-                night_pm = vars_by_shift.get(ShiftType.NIGHT, []) + vars_by_shift.get(
-                    ShiftType.PM, []
-                )
-                if night_day:
-                    model += (
-                        pulp.lpSum(night_day) <= 1,
-                        f"no_overlap_NIGHT_DAY_{w}_{d.strftime('%Y%m%d')}",
-                    )
-                if night_am:
-                    model += (
-                        pulp.lpSum(night_am) <= 1,
-                        f"no_overlap_NIGHT_AM_{w}_{d.strftime('%Y%m%d')}",
-                    )
-                if night_pm:
-                    model += (
-                        pulp.lpSum(night_pm) <= 1,
-                        f"no_overlap_NIGHT_PM_{w}_{d.strftime('%Y%m%d')}",
+            # 2) DAY-AM, 3) DAY-PM, 4) 休日のNIGHTと他シフトの重複禁止
+            # 片側が空なら 1) の行と同じになるため、両側に変数がある組だけ張る
+            day = vars_by_shift.get(ShiftType.DAY, empty)
+            am = vars_by_shift.get(ShiftType.AM, empty)
+            pm = vars_by_shift.get(ShiftType.PM, empty)
+            pairs = [("DAY_AM", day, am), ("DAY_PM", day, pm)]
+            if d in holidays:
+                night = vars_by_shift.get(ShiftType.NIGHT, empty)
+                pairs += [
+                    ("NIGHT_DAY", night, day),
+                    ("NIGHT_AM", night, am),
+                    ("NIGHT_PM", night, pm),
+                ]
+            for label, a, b in pairs:
+                if a and b:
+                    add_sum_constraint(
+                        model,
+                        itertools.chain(a, b),
+                        pulp.LpConstraintLE,
+                        1,
+                        f"no_overlap_{label}_{w}_{ymd}",
                     )
 
 
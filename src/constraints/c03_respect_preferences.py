@@ -3,7 +3,7 @@ from typing import ClassVar, override
 
 import pulp
 
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_var_index
 from src.io.preferences_loader import disallowed_shifts_for
 
 from .base import register
@@ -28,16 +28,22 @@ class RespectPreferencesFromCSV(ConstraintBase):
         self, model: pulp.LpProblem, x: Mapping[VarKey, pulp.LpVariable], ctx: Context
     ) -> None:
         pref = ctx.get("preferences", {})
-        for (h, w, d, s), var in x.items():
-            status = pref.get((w, d))
-            if status is None:
+        if not pref:
+            return
+        ensure_var_index(ctx, x)
+        by_wd = ctx["by_wd"]
+        # 禁止シフトは status ごとに一度だけ求める
+        disallowed_by_status = {
+            status: disallowed_shifts_for(status) for status in set(pref.values())
+        }
+        for (w, d), status in pref.items():
+            disallowed = disallowed_by_status[status]
+            if not disallowed:
                 continue
-            disallowed = disallowed_shifts_for(status)
-            if s in disallowed:
-                model += (
-                    var == 0,
-                    f"pref_forbid_{h}_{w}_{d.strftime('%Y%m%d')}_{s.name}",
-                )
+            for _h, s, var in by_wd.get((w, d), ()):
+                if s in disallowed:
+                    # 制約行を足さず、変数の上限を 0 にして固定する(presolve で消える)
+                    var.upBound = 0
 
 
 register(RespectPreferencesFromCSV())
@@ -1,13 +1,13 @@
-from collections import defaultdict
 from collections.abc import Mapping
 from typing import ClassVar, override
 
 import pulp
 
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_var_index
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_sum_constraint
 
 
 class MaxAssignmentsPerWorkerHospital(ConstraintBase):
@@ -26,18 +26,15 @@ class MaxAssignmentsPerWorkerHospital(ConstraintBase):
     ) -> None:
         caps = ctx["max_assignments"]  # {(w,h): Optional[int]}
         # (w,h) → [vars...]
-        by_wh = defaultdict(list)
-        for (h, w, _d, _s), var in x.items():
-            by_wh[(w, h)].append(var)
-
-        for (w, h), vars_wh in by_wh.items():
+        ensure_var_index(ctx, x)
+        for (w, h), vars_wh in ctx["by_wh"].items():
             cap = caps.get((w, h), None)
             if cap is None:
                 continue  # 上限なし
             if cap < 0:
                 continue  # 念のため
             # Σ_{d,s} x[h,w,d,s] ≤ cap
-            model += pulp.lpSum(vars_wh) <= cap, f"max_{w}_{h}"
+            add_sum_constraint(model, vars_wh, pulp.LpConstraintLE, cap, f"max_{w}_{h}")
 
 
 register(MaxAssignmentsPerWorkerHospital())
@@ -1,15 +1,15 @@
 from collections import defaultdict
 from collections.abc import Mapping
-from datetime import date
 from typing import ClassVar, override
 
 import pulp
 
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_day_index, ensure_var_index
 from src.domain.types import ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_sum_constraint
 
 
 class NightSpacing(ConstraintBase):
@@ -37,19 +37,19 @@ class NightSpacing(ConstraintBase):
         x: Mapping[VarKey, pulp.LpVariable],
         ctx: Context,
     ) -> None:
-        days: list[date] = ctx["days"]
-        # 並びは安全のため明示ソート
-        days = sorted(days)
+        ensure_day_index(ctx)
+        days = ctx["days_sorted"]
+        day_to_idx = ctx["day_to_idx"]
 
         # worker x day_index → その日の全病院NIGHTの変数リスト
         by_w_idx: defaultdict[str, defaultdict[int, list[pulp.LpVariable]]] = defaultdict(
             lambda: defaultdict(list)
         )
-        day_to_idx = {d: i for i, d in enumerate(days)}
 
-        for (_h, w, d, s), var in x.items():
+        ensure_var_index(ctx, x)
+        for (w, d, s), vars_wds in ctx["by_wds"].items():
             if s == ShiftType.NIGHT and d in day_to_idx:
-                by_w_idx[w][day_to_idx[d]].append(var)
+                by_w_idx[w][day_to_idx[d]].extend(vars_wds)
 
         # 各 worker について、連続 g 日のどの窓でも ≤1
         g = self.window_days
@@ -59,9 +59,13 @@ class NightSpacing(ConstraintBase):
                 vars_in_window = []
                 for j in range(i, i + g):
                     vars_in_window.extend(idx_map.get(j, []))
-                if vars_in_window:
-                    model += (
-                        pulp.lpSum(vars_in_window) <= 1,
+                # 窓内の変数が1つ以下なら ≤ 1 は自明なので行を作らない
+                if len(vars_in_window) > 1:
+                    add_sum_constraint(
+                        model,
+                        vars_in_window,
+                        pulp.LpConstraintLE,
+                        1,
                         f"night_spacing_{w}_{days[i].strftime('%Y%m%d')}_{
                             days[i + g - 1].strftime('%Y%m%d')
                         }",
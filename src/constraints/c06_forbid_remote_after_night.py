@@ -1,14 +1,14 @@
 from collections.abc import Mapping
-from datetime import date
 from typing import ClassVar, override
 
 import pulp
 
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_day_index, ensure_var_index
 from src.domain.types import Hospital, ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_sum_constraint
 
 
 class ForbidRemoteAfterNight(ConstraintBase):
@@ -30,7 +30,6 @@ class ForbidRemoteAfterNight(ConstraintBase):
         x: Mapping[VarKey, pulp.LpVariable],
         ctx: Context,
     ) -> None:
-        days: list[date] = sorted(ctx["days"])
         hospitals: list[Hospital] = ctx["hospitals"]
 
         # リモート病院名
@@ -41,31 +40,38 @@ class ForbidRemoteAfterNight(ConstraintBase):
         # 対象となる翌日のシフト種別
         next_day_forbidden_shifts = {ShiftType.DAY, ShiftType.AM}
 
+        # d → 翌日(days 上の次の日)
+        ensure_day_index(ctx)
+        days = ctx["days_sorted"]
+        next_day = {d: days[i + 1] for i, d in enumerate(days[:-1])}
+
         # 各 (worker, d) の当直 → (worker, d+1) のリモート DAY/AM を禁止
-        for i, d in enumerate(days):
-            if i + 1 >= len(days):
+        ensure_var_index(ctx, x)
+        by_wd = ctx["by_wd"]
+        for (w, d), entries in by_wd.items():
+            d_next = next_day.get(d)
+            if d_next is None:
                 continue
-            d_next = days[i + 1]
-
-            # d の当直変数を集めて、同一 worker の d+1 リモート DAY/AM を締める
-            # x: {(h, w, d, s): var}
-            for (h, w, dd, s), v_night in x.items():
-                if dd != d or s != ShiftType.NIGHT:
+            # 翌日のリモート(DAY/AM)候補を収集
+            remote_next_vars = [
+                v2
+                for h2, s2, v2 in by_wd.get((w, d_next), [])
+                if h2 in remote_hospitals and s2 in next_day_forbidden_shifts
+            ]
+            if not remote_next_vars:
+                continue
+            # 当直ごとに1行(c02 の有無に依存しないよう、当直どうしは束ねない)
+            ymd = d.strftime("%Y%m%d")
+            for h, s, v_night in entries:
+                if s != ShiftType.NIGHT:
                     continue
-                # 翌日のリモート(DAY/AM)候補を収集
-                remote_next_vars = [
-                    v2
-                    for (h2, w2, d2, s2), v2 in x.items()
-                    if w2 == w
-                    and d2 == d_next
-                    and h2 in remote_hospitals
-                    and s2 in next_day_forbidden_shifts
-                ]
-                if remote_next_vars:
-                    model += (
-                        v_night + pulp.lpSum(remote_next_vars) <= 1,
-                        f"forbid_remote_after_night_{h}_{w}_{d.strftime('%Y%m%d')}",
-                    )
+                add_sum_constraint(
+                    model,
+                    [v_night, *remote_next_vars],
+                    pulp.LpConstraintLE,
+                    1,
+                    f"forbid_remote_after_night_{h}_{w}_{ymd}",
+                )
 
 
 # 自動登録
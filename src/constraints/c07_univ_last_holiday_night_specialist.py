@@ -5,8 +5,8 @@ from typing import ClassVar, override
 
 import pulp
 
-from src.calendar.utils import is_last_holiday
-from src.domain.context import Context, VarKey
+from src.calendar.utils import last_holidays_in
+from src.domain.context import Context, VarKey, ensure_var_index
 from src.domain.types import Hospital, ShiftType, Worker
 
 from .base import register
@@ -17,7 +17,7 @@ class UnivLastHolidayNightSpecialistOnly(ConstraintBase):
     """
     連休(土日祝の連続)の最終日の【大学病院 x 当直】は
     is_diagnostic_specialist=True の勤務者のみ許可。
-    それ以外(非専門)は禁止(var == 0)。
+    それ以外(非専門)は禁止(変数の上限を 0 に固定)。
     """
 
     name = "univ_last_holiday_night_specialist_only"
@@ -31,7 +31,9 @@ class UnivLastHolidayNightSpecialistOnly(ConstraintBase):
         x: Mapping[VarKey, pulp.LpVariable],
         ctx: Context,
     ) -> None:
-        ctx["days"]
+        last_holidays = ctx.get("last_holidays")
+        if last_holidays is None:
+            last_holidays = last_holidays_in(ctx["days"])
         hospitals: list[Hospital] = ctx["hospitals"]
         workers: list[Worker] = ctx["workers"]
 
@@ -39,17 +41,15 @@ class UnivLastHolidayNightSpecialistOnly(ConstraintBase):
         specialists = {w.name for w in workers if w.is_diagnostic_specialist}
 
         # 該当条件:大学病院 x NIGHT x 連休最終日 x 非専門 → 禁止
-        for (h, w, d, s), var in x.items():
-            if (
-                h in univ_hospitals
-                and s == ShiftType.NIGHT
-                and is_last_holiday(d)
-                and w not in specialists
-            ):
-                cname = (
-                    f"forbid_univ_last_holiday_night_non_specialist_{h}_{w}_{d.strftime('%Y%m%d')}"
-                )
-                model += (var == 0, cname)
+        # (w, d) 単位で先に絞り込み、該当する日の変数だけを見る
+        ensure_var_index(ctx, x)
+        for (w, d), entries in ctx["by_wd"].items():
+            if d not in last_holidays or w in specialists:
+                continue
+            for h, s, var in entries:
+                if s == ShiftType.NIGHT and h in univ_hospitals:
+                    # 制約行は追加せず、変数を 0 に固定する
+                    var.upBound = 0
 
 
 register(UnivLastHolidayNightSpecialistOnly())
@@ -0,0 +1,38 @@
+from collections.abc import Iterable
+
+import pulp
+
+
+def add_linear_constraint(
+    model: pulp.LpProblem,
+    terms: Iterable[tuple[pulp.LpVariable, float]],
+    sense: int,
+    rhs: float,
+    name: str | None = None,
+) -> None:
+    """
+    Σ coef * var (sense) rhs の制約を model に追加する。
+    lpSum や演算子で式を積み上げず、(変数, 係数) の組から式を一度に組み立てて登録する。
+    terms に同じ変数が重複して含まれないこと(係数が合算されないため)。
+    name を省略した場合は PuLP が自動で名前を付ける。
+
+    sense: pulp.LpConstraintLE / pulp.LpConstraintEQ / pulp.LpConstraintGE
+    """
+    expr = pulp.LpAffineExpression(terms)
+    model.addConstraint(pulp.LpConstraint(expr, sense, name, rhs))
+
+
+def add_sum_constraint(
+    model: pulp.LpProblem,
+    variables: Iterable[pulp.LpVariable],
+    sense: int,
+    rhs: float,
+    name: str,
+) -> None:
+    """
+    Σ variables (sense) rhs の制約を model に追加する(係数はすべて 1)。
+    variables に同じ変数が重複して含まれないこと(係数が合算されないため)。
+
+    sense: pulp.LpConstraintLE / pulp.LpConstraintEQ / pulp.LpConstraintGE
+    """
+    add_linear_constraint(model, ((v, 1) for v in variables), sense, rhs, name)
@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import pulp
@@ -7,18 +8,35 @@ from src.domain.context import Context
 
 
 def add_penalties(
-    ctx: Context, name: str, penalty_items: list[tuple[pulp.LpVariable, float, Any]]
+    ctx: Context, name: str, penalty_items: Iterable[tuple[pulp.LpVariable, float, Any]]
 ) -> None:
     """
-    penalty_items: List[(LpVariable, weight, meta_dict)]
+    penalty_items: Iterable[(LpVariable, weight, meta_dict)]
         - var: 補助変数 (z)
         - weight: ペナルティ係数
         - meta: 任意の辞書 {"worker":..., "date":..., ...}
 
     ctx["penalties"]のList[PenaltyItem]にPenaltyItemを追加する
+    リストに限らずジェネレータも受け付け、途中のリストを作らずに1件ずつ追加する。
     """
-    if not penalty_items:
-        return
-    penalty_items_list = ctx.setdefault("penalties", [])
+    penalty_items_list = ctx.get("penalties")
     for var, weight, meta in penalty_items:
+        if penalty_items_list is None:
+            penalty_items_list = ctx.setdefault("penalties", [])
         penalty_items_list.append(PenaltyItem(var=var, weight=weight, meta=meta, source=name))
+
+
+def iter_scaled_penalties(ctx: Context) -> Iterator[tuple[PenaltyItem, float]]:
+    """
+    ctx["penalties"] の各 PenaltyItem を、weight に source 毎の倍率
+    (ctx["penalty_source_scale"], 既定 1.0)を掛けた実効重みと組にして返す。
+    倍率の参照と float 化は source ごとに1回だけ行う。
+    """
+    scale = ctx.get("penalty_source_scale", {})
+    factors: dict[str, float] = {}
+    for item in ctx.get("penalties", []):
+        _var, weight, _meta, source = item
+        factor = factors.get(source)
+        if factor is None:
+            factor = factors[source] = float(scale.get(source, 1.0))
+        yield item, factor * float(weight)
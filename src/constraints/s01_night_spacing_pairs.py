@@ -8,11 +8,12 @@ from typing import ClassVar, override
 import pulp
 
 from src.constraints.penalty_utils import add_penalties
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_var_index
 from src.domain.types import ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_linear_constraint
 
 
 class SoftNightSpacingPairs(ConstraintBase):
@@ -50,44 +51,61 @@ class SoftNightSpacingPairs(ConstraintBase):
         x: Mapping[VarKey, pulp.LpVariable],
         ctx: Context,
     ) -> None:
-        days: list[date] = sorted(ctx["days"])
-        if not days:
+        if not ctx["days"]:
             return
 
         # worker x day → その日に割当可能な「全病院の NIGHT 変数」集合
         by_w_d: dict[str, dict[date, list[pulp.LpVariable]]] = defaultdict(
             lambda: defaultdict(list)
         )
-        for (_h, w, d, s), var in x.items():
+        ensure_var_index(ctx, x)
+        for (w, d, s), vars_wds in ctx["by_wds"].items():
             if s == ShiftType.NIGHT:
-                by_w_d[w][d].append(var)
+                by_w_d[w][d].extend(vars_wds)
 
         penalty_items = []
+        # 変数名に使う日付文字列は日付ごとに一度だけ作る
+        # (x には ctx["days"] 外の日付の変数もありうるので、索引に現れた日付から作る)
+        ymd = {d: d.strftime("%Y%m%d") for m in by_w_d.values() for d in m}
 
         # y[w,d]: そのワーカーが d に当直するか(1 if any NIGHT chosen that day)
         y_vars: dict[tuple[str, date], pulp.LpVariable] = {}
         for w, m in by_w_d.items():
+            if len(m) < 2:
+                continue  # 当直候補日が1日以下ならペアが作れない
             for d, vars_on_d in m.items():
+                if len(vars_on_d) == 1:
+                    # 候補が1変数だけならその変数自体が指示変数になる
+                    y_vars[(w, d)] = vars_on_d[0]
+                    continue
                 y = pulp.LpVariable(
-                    f"night_ind_{w}_{d.strftime('%Y%m%d')}",
+                    f"night_ind_{w}_{ymd[d]}",
                     lowBound=0,
                     upBound=1,
                     cat="Binary",
                 )
                 # y ≥ 各変数、y ≤ その日の合計
                 for v in vars_on_d:
-                    model += y >= v
-                model += y <= pulp.lpSum(vars_on_d)
+                    add_linear_constraint(model, [(y, 1), (v, -1)], pulp.LpConstraintGE, 0)
+                add_linear_constraint(
+                    model, [(y, 1), *((v, -1) for v in vars_on_d)], pulp.LpConstraintLE, 0
+                )
                 y_vars[(w, d)] = y
 
+        # Δ → 重み(Δ < no_penalty_gap の範囲だけ持てば十分)
+        weights = [self._weight(delta) for delta in range(max(0, self.no_penalty_gap))]
+
         # ペア z[w,d1,d2] を作って距離別にペナルティ
         for w, m in by_w_d.items():
             dlist = sorted(m.keys())
-            for i in range(len(dlist)):
+            for i, d1 in enumerate(dlist):
+                # dlist は昇順なので、Δ が no_penalty_gap に達したら以降はペナルティなし
                 for j in range(i + 1, len(dlist)):
-                    d1, d2 = dlist[i], dlist[j]
+                    d2 = dlist[j]
                     delta = (d2 - d1).days
-                    weight = self._weight(delta)
+                    if delta >= len(weights):
+                        break
+                    weight = weights[delta]
                     if weight <= 0:
                         continue
 
@@ -95,14 +113,16 @@ class SoftNightSpacingPairs(ConstraintBase):
                     y2 = y_vars[(w, d2)]
                     # z = AND(y1, y2) を線形化
                     z = pulp.LpVariable(
-                        f"soft_night_spacing_{w}_{d1.strftime('%Y%m%d')}_{d2.strftime('%Y%m%d')}",
+                        f"soft_night_spacing_{w}_{ymd[d1]}_{ymd[d2]}",
                         lowBound=0,
                         upBound=1,
                         cat="Binary",
                     )
-                    model += z <= y1
-                    model += z <= y2
-                    model += z >= y1 + y2 - 1
+                    add_linear_constraint(model, [(z, 1), (y1, -1)], pulp.LpConstraintLE, 0)
+                    add_linear_constraint(model, [(z, 1), (y2, -1)], pulp.LpConstraintLE, 0)
+                    add_linear_constraint(
+                        model, [(z, 1), (y1, -1), (y2, -1)], pulp.LpConstraintGE, -1
+                    )
 
                     penalty_items.append(
                         (z, weight, {"worker": w, "d1": d1, "d2": d2, "delta": delta})
@@ -5,11 +5,12 @@ from typing import ClassVar, override
 import pulp
 
 from src.constraints.penalty_utils import add_penalties
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_var_index
 from src.domain.types import Hospital, ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_linear_constraint
 
 
 class SoftNoNightRemoteDayPmSameDay(ConstraintBase):
@@ -35,56 +36,54 @@ class SoftNoNightRemoteDayPmSameDay(ConstraintBase):
     ) -> None:
         days: list[date] = ctx["days"]
         hospitals: list[Hospital] = ctx["hospitals"]
-        remote_hospitals = {h.name for h in hospitals if h.is_remote}
+        remote_hospitals = frozenset(h.name for h in hospitals if h.is_remote)
 
         if not days or not remote_hospitals:
             return
 
         penalty_items = []
-
-        for w in {key[1] for key in x}:
-            for d in days:
-                night_vars = [
-                    var
-                    for (h, ww, dd, s), var in x.items()
-                    if ww == w and dd == d and s == ShiftType.NIGHT
-                ]
-                remote_daypm_vars = [
-                    var
-                    for (h, ww, dd, s), var in x.items()
-                    if ww == w
-                    and dd == d
-                    and h in remote_hospitals
-                    and s in (ShiftType.DAY, ShiftType.PM)
-                ]
-
-                if night_vars and remote_daypm_vars:
-                    # y_night
-                    y_n = pulp.LpVariable(f"y_night_{w}_{d.strftime('%Y%m%d')}", 0, 1, cat="Binary")
-                    for v in night_vars:
-                        model += y_n >= v
-                    model += y_n <= pulp.lpSum(night_vars)
-
-                    # y_remote_daypm
-                    y_r = pulp.LpVariable(
-                        f"y_remote_daypm_{w}_{d.strftime('%Y%m%d')}", 0, 1, cat="Binary"
-                    )
-                    for v in remote_daypm_vars:
-                        model += y_r >= v
-                    model += y_r <= pulp.lpSum(remote_daypm_vars)
-
-                    # z = AND(y_n, y_r)
-                    z = pulp.LpVariable(
-                        f"z_conflict_night_remote_{w}_{d.strftime('%Y%m%d')}",
-                        0,
-                        1,
-                        cat="Binary",
-                    )
-                    model += z <= y_n
-                    model += z <= y_r
-                    model += z >= y_n + y_r - 1
-
-                    penalty_items.append((z, self.weight, {"worker": w, "date": d.isoformat()}))
+        day_set = frozenset(days)
+        # 変数名・meta に使う日付文字列は日付ごとに一度だけ作る
+        ymd = {d: d.strftime("%Y%m%d") for d in days}
+        iso = {d: d.isoformat() for d in days}
+
+        # (w, d) ごとの索引を1回だけ走査して、当直と遠隔 DAY/PM に振り分ける
+        ensure_var_index(ctx, x)
+        for (w, d), entries in ctx["by_wd"].items():
+            if d not in day_set:
+                continue
+            # 当直候補の無い (w, d) が大半なので、先に当直を見て無ければ飛ばす
+            night_vars = [var for _h, s, var in entries if s == ShiftType.NIGHT]
+            if not night_vars:
+                continue
+            remote_daypm_vars = [
+                var
+                for h, s, var in entries
+                if s in (ShiftType.DAY, ShiftType.PM) and h in remote_hospitals
+            ]
+
+            if remote_daypm_vars:
+                # z = AND(OR(night_vars), OR(remote_daypm_vars))
+                # 指示変数 y を作らず、元の変数の組ごとに z を下から押さえる
+                z = pulp.LpVariable(
+                    f"z_conflict_night_remote_{w}_{ymd[d]}",
+                    0,
+                    1,
+                    cat="Binary",
+                )
+                add_linear_constraint(
+                    model, [(z, 1), *((v, -1) for v in night_vars)], pulp.LpConstraintLE, 0
+                )
+                add_linear_constraint(
+                    model, [(z, 1), *((v, -1) for v in remote_daypm_vars)], pulp.LpConstraintLE, 0
+                )
+                for v_n in night_vars:
+                    for v_r in remote_daypm_vars:
+                        add_linear_constraint(
+                            model, [(z, 1), (v_n, -1), (v_r, -1)], pulp.LpConstraintGE, -1
+                        )
+
+                penalty_items.append((z, self.weight, {"worker": w, "date": iso[d]}))
         add_penalties(ctx, "soft_no_night_remote_daypm_same_day", penalty_items)
 
 
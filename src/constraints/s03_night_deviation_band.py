@@ -6,12 +6,13 @@ from typing import ClassVar, override
 
 import pulp
 
-from src.calendar.utils import is_holiday_or_weekend
+from src.calendar.utils import holidays_in
 from src.domain.context import Context, VarKey
 from src.domain.types import Hospital, ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_linear_constraint
 from .penalty_utils import add_penalties
 
 
@@ -44,9 +45,6 @@ class SoftNightDeviationBand(ConstraintBase):
         self.min_candidate_nights = int(min_candidate_nights)
         self.holiday_weight = float(holiday_weight)
 
-    def _get_holiday_weight(self, d: date) -> float:
-        return self.holiday_weight if is_holiday_or_weekend(d) else 1.0
-
     @override
     def apply(
         self,
@@ -61,19 +59,33 @@ class SoftNightDeviationBand(ConstraintBase):
         # 病院ごとの Night 対象日(候補変数が存在する日)を集計
         night_days_by_h: dict[str, set[date]] = {}
 
+        # 病院ごとの worker(初出順)
+        workers_by_h: dict[str, list[str]] = {}
+
         for (h, w, d, s), var in x.items():
             if s == ShiftType.NIGHT:
-                hw_vars.setdefault((h, w), []).append((d, var))
+                vars_hw = hw_vars.get((h, w))
+                if vars_hw is None:
+                    vars_hw = hw_vars[(h, w)] = []
+                    workers_by_h.setdefault(h, []).append(w)
+                vars_hw.append((d, var))
                 night_days_by_h.setdefault(h, set()).add(d)
 
+        # 日付 → 重み(平日=1.0, 休日=holiday_weight)は日付ごとに一度だけ求める
+        night_days = set().union(*night_days_by_h.values())
+        holidays = ctx.get("holidays")
+        if holidays is None:
+            holidays = holidays_in(night_days)
+        weight_of = {d: self.holiday_weight if d in holidays else 1.0 for d in night_days}
+
         penalty_items = []
 
         for h in (hh.name for hh in hospitals):
             # その病院で Night に入れる候補者(候補日が min_candidate_nights 以上)
             Wh = [
                 w
-                for (hh, w) in hw_vars
-                if hh == h and len(hw_vars[(h, w)]) >= self.min_candidate_nights
+                for w in workers_by_h.get(h, [])
+                if len(hw_vars[(h, w)]) >= self.min_candidate_nights
             ]
             Kh = len(Wh)
             days_h = sorted(night_days_by_h.get(h, []))
@@ -81,32 +93,40 @@ class SoftNightDeviationBand(ConstraintBase):
                 continue
 
             # 総需要(重み付き) T_h と平均 A_h
-            Th = sum(self._get_holiday_weight(d) for d in days_h)
+            Th = sum(weight_of[d] for d in days_h)
             Ah = Th / Kh
             Lh = int(Ah)  # floor
             Uh = Lh + 1  # ceil
 
-            # 各人の重み付きカウント
-            counts = {}
+            # 各人の重み付きカウント(変数, 重み) の組
+            counts: dict[str, list[tuple[pulp.LpVariable, float]]] = {}
             for w in Wh:
-                terms = [self._get_holiday_weight(d) * var for (d, var) in hw_vars[(h, w)]]
-                counts[w] = pulp.lpSum(terms) if terms else pulp.lpSum([])
+                counts[w] = [(var, weight_of[d]) for (d, var) in hw_vars[(h, w)]]
 
             # バンド外だけペナルティ
+            # 取り得ない側(c の上限が U 以下 → over、L が 0 以下 → under)は変数も行も作らない
             for w in Wh:
-                over = pulp.LpVariable(f"night_dev_over_{h}_{w}", lowBound=0)
-                under = pulp.LpVariable(f"night_dev_under_{h}_{w}", lowBound=0)
-                model += over >= counts[w] - Uh
-                model += under >= Lh - counts[w]
-
-                penalty_items.append(
-                    (over, self.weight_over, {"hospital": h, "worker": w, "kind": "over"})
-                )
-                penalty_items.append(
-                    (under, self.weight_under, {"hospital": h, "worker": w, "kind": "under"})
-                )
+                if _max_count(counts[w]) > Uh:
+                    over = pulp.LpVariable(f"night_dev_over_{h}_{w}", lowBound=0)
+                    # over >= c - U  ⇔  c - over <= U
+                    add_linear_constraint(model, [*counts[w], (over, -1)], pulp.LpConstraintLE, Uh)
+                    penalty_items.append(
+                        (over, self.weight_over, {"hospital": h, "worker": w, "kind": "over"})
+                    )
+                if Lh > 0:
+                    under = pulp.LpVariable(f"night_dev_under_{h}_{w}", lowBound=0)
+                    # under >= L - c  ⇔  c + under >= L
+                    add_linear_constraint(model, [*counts[w], (under, 1)], pulp.LpConstraintGE, Lh)
+                    penalty_items.append(
+                        (under, self.weight_under, {"hospital": h, "worker": w, "kind": "under"})
+                    )
 
         add_penalties(ctx, self.name, penalty_items)
 
 
+def _max_count(terms: list[tuple[pulp.LpVariable, float]]) -> float:
+    """重み付きカウントの上限(上限 0 に固定済みの変数は数えない)"""
+    return sum(coef for var, coef in terms if var.upBound != 0)
+
+
 register(SoftNightDeviationBand())
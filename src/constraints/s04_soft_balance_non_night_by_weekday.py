@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Mapping
 from datetime import date
 from typing import ClassVar, override
@@ -11,8 +12,14 @@ from src.domain.types import Hospital, ShiftType, Weekday
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_linear_constraint
 from .penalty_utils import add_penalties
 
+# Weekday Enum は月曜=0 ... 日曜=6 の順で定義済み前提
+_WEEKDAYS = tuple(Weekday)
+
+_BucketKey = tuple[str, Weekday, ShiftType]  # (病院名, 曜日, シフト)
+
 
 class SoftNonNightBalanceByWeekday(ConstraintBase):
     """
@@ -53,85 +60,94 @@ class SoftNonNightBalanceByWeekday(ConstraintBase):
     ) -> None:
         hospitals: list[Hospital] = ctx["hospitals"]
 
-        # VarKey(h, w, d, s) のうち s ∈ target_shifts だけ集約
-        # 併せて (h, weekday, s) ごとの対象日集合を作る
-        hwds_vars: dict[VarKey, pulp.LpVariable] = {}
-        days_by_h_ws: dict[tuple[str, Weekday, ShiftType], list[date]] = {}
-
-        def to_weekday(d: date) -> Weekday:
-            # Weekday Enum は月曜=0 ... 日曜=6 の順で定義済み前提
-            return list(Weekday)[d.weekday()]
-
-        for var_key, var in x.items():
-            h, w, d, s = var_key
-            if s in self.target_shifts:
-                hwds_vars[var_key] = var
-                key = (h, to_weekday(d), s)
-                days_by_h_ws.setdefault(key, []).append(d)
+        # VarKey(h, w, d, s) のうち s ∈ target_shifts だけを1回の走査で
+        # (h, weekday, s) → worker → 変数 に振り分け、併せて対象日集合を作る
+        buckets: defaultdict[_BucketKey, defaultdict[str, list[pulp.LpVariable]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        days_by_bucket: defaultdict[_BucketKey, set[date]] = defaultdict(set)
+        keys_by_h: defaultdict[str, list[_BucketKey]] = defaultdict(list)
+
+        # 日付 → 曜日 は日付ごとに一度だけ求める
+        weekday_of: dict[date, Weekday] = {}
+
+        for (h, w, d, s), var in x.items():
+            if s not in self.target_shifts:
+                continue
+            weekday = weekday_of.get(d)
+            if weekday is None:
+                weekday = weekday_of[d] = _WEEKDAYS[d.weekday()]
+            key = (h, weekday, s)
+            if key not in buckets:
+                keys_by_h[h].append(key)
+            buckets[key][w].append(var)
+            days_by_bucket[key].add(d)
 
         penalty_items = []
 
         for hosp in hospitals:
             hname = hosp.name
             # 病院ごとに (weekday, s) を走査
-            for (hh, weekday, s), days in list(days_by_h_ws.items()):
-                if hh != hname:
-                    continue
-                days = sorted(set(days))
-                if not days:
-                    continue
+            for key in keys_by_h.get(hname, ()):
+                _, weekday, s = key
+                vars_by_w = buckets[key]
 
                 # 候補者集合 Wh(この (h,weekday,s) で min_candidate 以上の候補がある人)
                 # 候補数 = その人に対し、対象日 d の x[(h,w,d,s)] が存在する個数
-                cand_count_by_w: dict[str, int] = {}
-                for h2, w2, d2, s2 in hwds_vars:
-                    if h2 == hname and s2 == s and to_weekday(d2) == weekday:
-                        cand_count_by_w[w2] = cand_count_by_w.get(w2, 0) + 1
-                Wh = [w for w, cnt in cand_count_by_w.items() if cnt >= self.min_candidate]
+                Wh = [w for w, vars_w in vars_by_w.items() if len(vars_w) >= self.min_candidate]
                 Kh = len(Wh)
                 if Kh <= 1:
                     continue
 
                 # その (h,weekday,s) の総回数(重み1.0)
-                Th = float(len(days))
+                Th = float(len(days_by_bucket[key]))
                 Ah = Th / Kh
                 Lh = int(Ah)  # floor
                 Uh = Lh + 1  # ceil
 
                 # 各 worker の回数 c = Σ_d x[h,w,d,s]
-                counts: dict[str, pulp.LpAffineExpression] = {}
-                for w in Wh:
-                    terms = []
-                    for d in days:
-                        var = hwds_vars.get(VarKey(hname, w, d, s))
-                        if var is not None:
-                            terms.append(var)
-                    counts[w] = pulp.lpSum(terms) if terms else pulp.lpSum([])
+                counts = {w: vars_by_w[w] for w in Wh}
+
+                # meta はバケット内の worker で共通なので1回だけ作って使い回す(参照専用)
+                meta = {
+                    "hospital": hname,
+                    "weekday": weekday.value,
+                    "shift": s.value,
+                    "kind": None,  # 後で上書き
+                    "T": Th,
+                    "K": Kh,
+                    "L": Lh,
+                    "U": Uh,
+                }
+                meta_over = {**meta, "kind": "over"}
+                meta_under = {**meta, "kind": "under"}
 
                 # over/under 変数を置いてバンド外だけペナルティ
+                # 変数名の共通部分はバケットごとに一度だけ組み立てる
+                name_key = f"{hname}_{weekday.value}_{s.value}"
+                # 取り得ない側(c の上限が U 以下 → over、L が 0 以下 → under)は変数も行も作らない
                 for w in Wh:
-                    over = pulp.LpVariable(
-                        f"non_night_dev_over_{hname}_{weekday.value}_{s.value}_{w}", lowBound=0
-                    )
-                    under = pulp.LpVariable(
-                        f"non_night_dev_under_{hname}_{weekday.value}_{s.value}_{w}", lowBound=0
-                    )
-                    model += over >= counts[w] - Uh
-                    model += under >= Lh - counts[w]
-
-                    meta = {
-                        "hospital": hname,
-                        "weekday": weekday.value,
-                        "shift": s.value,
-                        "kind": None,  # 後で上書き
-                        "T": Th,
-                        "K": Kh,
-                        "L": Lh,
-                        "U": Uh,
-                    }
-                    pi_over = (over, self.weight_over, {**meta, "kind": "over"})
-                    pi_under = (under, self.weight_under, {**meta, "kind": "under"})
-                    penalty_items.extend([pi_over, pi_under])
+                    vars_w = counts[w]
+                    if sum(1 for v in vars_w if v.upBound != 0) > Uh:
+                        over = pulp.LpVariable(f"non_night_dev_over_{name_key}_{w}", lowBound=0)
+                        # over >= c - U  ⇔  c - over <= U
+                        add_linear_constraint(
+                            model,
+                            [*((v, 1) for v in vars_w), (over, -1)],
+                            pulp.LpConstraintLE,
+                            Uh,
+                        )
+                        penalty_items.append((over, self.weight_over, meta_over))
+                    if Lh > 0:
+                        under = pulp.LpVariable(f"non_night_dev_under_{name_key}_{w}", lowBound=0)
+                        # under >= L - c  ⇔  c + under >= L
+                        add_linear_constraint(
+                            model,
+                            [*((v, 1) for v in vars_w), (under, 1)],
+                            pulp.LpConstraintGE,
+                            Lh,
+                        )
+                        penalty_items.append((under, self.weight_under, meta_under))
 
         add_penalties(ctx, self.name, penalty_items)
 
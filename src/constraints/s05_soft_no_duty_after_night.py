@@ -5,11 +5,12 @@ from typing import ClassVar, override
 import pulp
 
 from src.constraints.penalty_utils import add_penalties
-from src.domain.context import Context, VarKey
+from src.domain.context import Context, VarKey, ensure_var_index
 from src.domain.types import ShiftType
 
 from .base import register
 from .base_impl import ConstraintBase
+from .lp_utils import add_linear_constraint
 
 
 class SoftNoDutyAfterNight(ConstraintBase):
@@ -39,59 +40,58 @@ class SoftNoDutyAfterNight(ConstraintBase):
             return
 
         penalty_items = []
-
-        for w in {key[1] for key in x}:
-            for d in days:
-                next_d = d + timedelta(days=1)
-                if next_d not in ctx["days"]:
-                    continue  # 次の日が勤務日でない場合はスキップ
-                night_vars = [
-                    var
-                    for (h, ww, dd, s), var in x.items()
-                    if ww == w and dd == d and s == ShiftType.NIGHT
-                ]
-                duty_vars = [
-                    var
-                    for (_, ww, dd, s), var in x.items()
-                    if ww == w and dd == next_d and s in (ShiftType.DAY, ShiftType.AM)
-                ]
-                if not night_vars or not duty_vars:
-                    continue
-
-                # y_night
-                y_n = pulp.LpVariable(
-                    f"y_night_before_duty_{w}_{d.strftime('%Y%m%d')}", 0, 1, cat="Binary"
-                )
-                for v in night_vars:
-                    model += y_n >= v
-                model += y_n <= pulp.lpSum(night_vars)
-
-                # y_next_day_duty
-                y_d = pulp.LpVariable(
-                    f"y_duty_after_night_{w}_{next_d.strftime('%Y%m%d')}", 0, 1, cat="Binary"
-                )
-                for v in duty_vars:
-                    model += y_d >= v
-                model += y_d <= pulp.lpSum(duty_vars)
-
-                # z = AND(y_n, y_d)
-                z = pulp.LpVariable(
-                    f"z_conflict_night_next_duty_{w}_{d.strftime('%Y%m%d')}",
-                    0,
-                    1,
-                    cat="Binary",
-                )
-                model += z <= y_n
-                model += z <= y_d
-                model += z >= y_n + y_d - 1
-
-                penalty_items.append(
-                    (
-                        z,
-                        self.weight,
-                        {"worker": w, "night_date": d.isoformat(), "next_date": next_d.isoformat()},
+        days_set = frozenset(days)
+        # 変数名・meta に使う日付文字列は日付ごとに一度だけ作る
+        ymd = {d: d.strftime("%Y%m%d") for d in days}
+        iso = {d: d.isoformat() for d in days}
+
+        # (w, d) ごとの索引から当直と翌日の DAY/AM を引く
+        ensure_var_index(ctx, x)
+        by_wd = ctx["by_wd"]
+        for (w, d), entries in by_wd.items():
+            if d not in days_set:
+                continue
+            night_vars = [var for _h, s, var in entries if s == ShiftType.NIGHT]
+            if not night_vars:
+                continue
+            next_d = d + timedelta(days=1)
+            if next_d not in days_set:
+                continue  # 次の日が勤務日でない場合はスキップ
+            duty_vars = [
+                var
+                for _h, s, var in by_wd.get((w, next_d), ())
+                if s in (ShiftType.DAY, ShiftType.AM)
+            ]
+            if not duty_vars:
+                continue
+
+            # z = AND(OR(night_vars), OR(duty_vars))
+            # 指示変数 y を作らず、元の変数の組ごとに z を下から押さえる
+            z = pulp.LpVariable(
+                f"z_conflict_night_next_duty_{w}_{ymd[d]}",
+                0,
+                1,
+                cat="Binary",
+            )
+            add_linear_constraint(
+                model, [(z, 1), *((v, -1) for v in night_vars)], pulp.LpConstraintLE, 0
+            )
+            add_linear_constraint(
+                model, [(z, 1), *((v, -1) for v in duty_vars)], pulp.LpConstraintLE, 0
+            )
+            for v_n in night_vars:
+                for v_d in duty_vars:
+                    add_linear_constraint(
+                        model, [(z, 1), (v_n, -1), (v_d, -1)], pulp.LpConstraintGE, -1
                     )
+
+            penalty_items.append(
+                (
+                    z,
+                    self.weight,
+                    {"worker": w, "night_date": iso[d], "next_date": iso[next_d]},
                 )
+            )
         add_penalties(ctx, "soft_no_duty_after_night", penalty_items)
 
 
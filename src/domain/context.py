@@ -1,3 +1,5 @@
+from collections import defaultdict
+from collections.abc import Mapping
 from datetime import date
 from typing import NamedTuple, Required, TypedDict
 
@@ -33,3 +35,63 @@ class Context(TypedDict, total=False):
     shortage_slack: dict[tuple[str, date], LpVariable]  # (病院名, 日付)ごとの不足スラック変数
     penalties: list[PenaltyItem]  # ソフト制約から追加されるペナルティのリスト
     penalty_source_scale: dict[str, float]  # ソフト制約毎の重み付のスケール
+    holidays: frozenset[date]  # days のうち土日祝の日
+    last_holidays: frozenset[date]  # days のうち連休最終日
+    days_sorted: list[date]  # days を昇順に並べたもの(build_day_index で構築)
+    day_to_idx: dict[date, int]  # 日付 → days_sorted 上の位置
+
+    # 変数の索引(build_var_index で x を1回走査して構築する)
+    by_hd: dict[tuple[str, date], list[LpVariable]]  # (病院名, 日付) → 変数
+    by_wd: dict[
+        tuple[str, date], list[tuple[str, ShiftType, LpVariable]]
+    ]  # (勤務者, 日付) → (病院名, シフト, 変数)
+    by_wh: dict[tuple[str, str], list[LpVariable]]  # (勤務者, 病院名) → 変数
+    by_wds: dict[tuple[str, date, ShiftType], list[LpVariable]]  # (勤務者, 日付, シフト) → 変数
+
+
+def build_var_index(ctx: Context, x: Mapping[VarKey, LpVariable]) -> None:
+    """
+    x を1回だけ走査して、各制約が共通で使う索引を ctx に格納する。
+    制約ごとに x 全体を走査し直さずに済むようにするためのもの。
+    """
+    by_hd: defaultdict[tuple[str, date], list[LpVariable]] = defaultdict(list)
+    by_wd: defaultdict[tuple[str, date], list[tuple[str, ShiftType, LpVariable]]] = defaultdict(
+        list
+    )
+    by_wh: defaultdict[tuple[str, str], list[LpVariable]] = defaultdict(list)
+    by_wds: defaultdict[tuple[str, date, ShiftType], list[LpVariable]] = defaultdict(list)
+    for (h, w, d, s), var in x.items():
+        by_hd[(h, d)].append(var)
+        by_wd[(w, d)].append((h, s, var))
+        by_wh[(w, h)].append(var)
+        by_wds[(w, d, s)].append(var)
+
+    # dict へのコピーはせず、default_factory を外して通常の dict と同じ振る舞いにする
+    for index in (by_hd, by_wd, by_wh, by_wds):
+        index.default_factory = None
+    ctx["by_hd"] = by_hd
+    ctx["by_wd"] = by_wd
+    ctx["by_wh"] = by_wh
+    ctx["by_wds"] = by_wds
+
+
+def ensure_var_index(ctx: Context, x: Mapping[VarKey, LpVariable]) -> None:
+    """索引が未構築なら構築する(ctx を手組みした場合など)"""
+    if "by_hd" not in ctx:
+        build_var_index(ctx, x)
+
+
+def build_day_index(ctx: Context) -> None:
+    """
+    昇順の日付リストと 日付 → 位置 の対応を ctx に格納する。
+    制約ごとに並べ替えや対応表の構築を繰り返さず、全制約で同じ並びを使うためのもの。
+    """
+    days = sorted(ctx["days"])
+    ctx["days_sorted"] = days
+    ctx["day_to_idx"] = {d: i for i, d in enumerate(days)}
+
+
+def ensure_day_index(ctx: Context) -> None:
+    """日付の索引が未構築なら構築する(ctx を手組みした場合など)"""
+    if "day_to_idx" not in ctx:
+        build_day_index(ctx)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -25,28 +25,38 @@ class Frequency(str, Enum):
     SPECIFIC_DAYS = "指定日"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkerAssignmentRule:
     hospital: str
     weekdays: list[Weekday]
     shift_type: ShiftType
+    # 曜日の所属判定用(weekdays から生成)
+    weekday_set: frozenset[Weekday] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self.weekday_set = frozenset(self.weekdays)
 
-@dataclass
+
+@dataclass(slots=True)
 class Worker:
     name: str
     assignments: list[WorkerAssignmentRule]  # その人が入り得る(病院 x 曜日 x シフト)
     is_diagnostic_specialist: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class HospitalDemandRule:
     shift_type: ShiftType
     weekdays: list[Weekday]
     frequency: Frequency
+    # 曜日の所属判定用(weekdays から生成)
+    weekday_set: frozenset[Weekday] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.weekday_set = frozenset(self.weekdays)
 
 
-@dataclass
+@dataclass(slots=True)
 class Hospital:
     name: str
     is_remote: bool
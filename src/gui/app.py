@@ -1,28 +1,51 @@
+from __future__ import annotations
+
 import contextlib
+import datetime
+import heapq
 import json
+import shutil
+import time
+import tomllib
 import traceback
+from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
-
-import pandas as pd
-import tomlkit
-from pandas.api.types import is_integer_dtype
-from PySide6.QtCore import Qt
+from typing import TYPE_CHECKING, Any, cast
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    Qt,
+    QTimer,
+)
+from PySide6.QtGui import QColor, QKeyEvent
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QFileDialog,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QMainWindow,
     QMessageBox,
     QPlainTextEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTabWidget,
     QVBoxLayout,
     QWidget,
 )
 
+# pandas / numpy は読み込みに時間がかかるので、使う処理の中で import する
+# (ウィンドウを出すまでの起動時間を短くするため)
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
 # {project_root}/src/gui/app.py から 2 つ上が project_root
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CONFIG_DIR = PROJECT_ROOT / "config"
@@ -32,6 +55,8 @@ DATA_DIR = PROJECT_ROOT / "data"
 MAX_ASSIGNMENTS_PATH = DATA_DIR / "max-assignments.csv"
 SPECIFIED_DATES_PATH = DATA_DIR / "specified-dates.toml"
 
+LOG_FLUSH_INTERVAL_MS = 50  # ログ表示をまとめて反映する間隔
+
 
 # -------- ユーティリティ --------
 def info(parent: QWidget, msg: str) -> None:
@@ -51,75 +76,222 @@ def coerce_int_columns(df: pd.DataFrame) -> pd.DataFrame:
     各列を数値化し、全ての非NAが整数値なら pandas の nullable 整数型(Int64)にする。
     例: 1.0, 2.0, "" -> 1, 2, <NA>
     """
-    out = df.copy()
-    for c in out.columns:
-        s = pd.to_numeric(out[c], errors="coerce")  # 数値以外→NA
-        if s.notna().any() and ((s.dropna() % 1) == 0).all():
-            # 小数部が無い(= すべて整数として表せる)列だけ Int64 へ
-            out[c] = s.astype("Int64")
+    import numpy as np
+    import pandas as pd
+
+    cols: list[pd.Series] = []
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if isinstance(col.dtype, pd.Int64Dtype):
+            cols.append(col)
+            continue
+        s = pd.to_numeric(col, errors="coerce")  # 数値以外→NA
+        vals = s.to_numpy(dtype="float64", na_value=np.nan)
+        vals = vals[~np.isnan(vals)]
+        # 小数部が無い(= すべて整数として表せる)列だけ Int64 へ
+        if vals.size and np.isfinite(vals).all() and (vals == np.trunc(vals)).all():
+            cols.append(s.astype("Int64"))
+        else:
+            cols.append(col)
+    # 列を揃えてから一度だけ組み立てる(元の DataFrame は複製しない)
+    out = pd.DataFrame(dict(enumerate(cols)), index=df.index)
+    out.columns = df.columns
     return out
 
 
-def df_to_table(table: QTableWidget, df: pd.DataFrame) -> None:
-    table.clear()
-    table.setRowCount(len(df))
-    table.setColumnCount(len(df.columns))
-    table.setHorizontalHeaderLabels([str(c) for c in df.columns])
-
-    for r in range(len(df)):
-        for c in range(len(df.columns)):
-            v = df.iat[r, c]
-            item = QTableWidgetItem()
-            if pd.isna(v):
-                item.setText("")
-            else:
-                # ✅ dtype は位置で取るなら iloc、もしくは列名で参照
-                # dtype = df.dtypes.iloc[c]
-                dtype = df.dtypes[df.columns[c]]
-                is_int_col = is_integer_dtype(dtype)
-
-                # 値自体が整数相当かも判定(小数 1.0 → 1 表示したいケース)
-                try:
-                    f = float(v)
-                    is_int_like = float(f).is_integer()
-                except Exception:
-                    is_int_like = False
-
-                if is_int_col or is_int_like:
-                    # Qt の DisplayRole に int を渡すと綺麗に整数表示されます
-                    item.setData(Qt.ItemDataRole.DisplayRole, int(float(v)))
-                else:
-                    item.setText(str(v))
+_Index = QModelIndex | QPersistentModelIndex
+
 
-            table.setItem(r, c, item)
+@dataclass(slots=True)
+class _ColumnCache:
+    """DataFrameModel が表示に使う列ごとの情報(セルごとの判定を避けるため一括で求める)"""
+
+    is_int: bool  # 整数列かどうか
+    values: np.ndarray  # セル参照のたびに iat を通さないための値配列
+    na: np.ndarray  # NA かどうか(セルごとの pd.isna の代わり)
+    whole: np.ndarray | None  # 小数列のみ: 整数相当(1.0 など)の値かどうか
+
+    @classmethod
+    def of(cls, col: pd.Series) -> _ColumnCache:
+        import numpy as np
+        from pandas.api.types import is_float_dtype, is_integer_dtype
+
+        whole = None
+        if is_float_dtype(col.dtype):
+            vals = col.to_numpy(dtype="float64", na_value=np.nan)
+            whole = np.isfinite(vals) & (vals == np.trunc(vals))
+        return cls(
+            is_int=is_integer_dtype(col.dtype),
+            values=col.to_numpy(dtype=object),
+            na=col.isna().to_numpy(),
+            whole=whole,
+        )
+
+
+class DataFrameModel(QAbstractTableModel):
+    """
+    DataFrame をそのまま保持して QTableView に見せるモデル。
+    セルごとに QTableWidgetItem を作らず、表示時に必要なセルだけ値を引く。
+    """
 
+    def __init__(self, df: pd.DataFrame, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._df = df
+        self._columns = [_ColumnCache.of(df.iloc[:, c]) for c in range(df.shape[1])]
+
+    def dataframe(self) -> pd.DataFrame:
+        return self._df
+
+    def rowCount(self, parent: _Index | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self._df)
+
+    def columnCount(self, parent: _Index | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self._df.columns)
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> object:
+        if not index.isValid() or role not in (
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.EditRole,
+        ):
+            return None
+        r, c = index.row(), index.column()
+        col = self._columns[c]
+        if col.na[r]:
+            return ""
+        v = col.values[r]
+        if col.is_int:
+            # Qt の DisplayRole に int を渡すと綺麗に整数表示されます
+            return int(v)
+        whole = col.whole
+        if whole is not None:
+            return int(v) if whole[r] else str(v)
+        # 文字列などは値自体が整数相当かも判定(小数 1.0 → 1 表示したいケース)
+        try:
+            f = float(v)
+        except Exception:
+            return str(v)
+        return int(f) if f.is_integer() else str(v)
+
+    def setData(self, index: _Index, value: object, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        import pandas as pd
+
+        r, c = index.row(), index.column()
+        v = pd.NA if value is None or value == "" else value
+        try:
+            self._df.iat[r, c] = v
+        except (TypeError, ValueError):
+            # 列の型に収まらない入力(整数列に文字列など)は列を object に落として保持
+            self._df.isetitem(c, self._df.iloc[:, c].astype(object))
+            self._df.iat[r, c] = v
+        self._columns[c] = _ColumnCache.of(self._df.iloc[:, c])
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index: _Index) -> Qt.ItemFlag:
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> object:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return str(self._df.columns[section])
+        return section + 1
+
+
+class LogModel(QAbstractTableModel):
+    """時刻・メッセージ・文字色を行として持つログ用モデル"""
+
+    HEADERS = ("時刻", "メッセージ")
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._rows: list[tuple[str, str, QColor | None]] = []
+
+    def rowCount(self, parent: _Index | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: _Index | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> object:
+        if not index.isValid():
+            return None
+        timestamp, message, color = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return timestamp if index.column() == 0 else message
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == 1:
+            return color
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> object:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+
+    def append(self, timestamp: str, message: str, color: QColor | None = None) -> None:
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n)
+        self._rows.append((timestamp, message, color))
+        self.endInsertRows()
+
+    def extend(self, rows: list[tuple[str, str, QColor | None]]) -> None:
+        if not rows:
+            return
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+
+def df_to_table(table: QTableView, df: pd.DataFrame) -> None:
+    table.setModel(DataFrameModel(df, table))
     table.resizeColumnsToContents()
 
 
-def table_to_df(table: QTableWidget) -> pd.DataFrame:
-    rows = table.rowCount()
-    cols = table.columnCount()
-    headers = []
-    for c in range(cols):
-        header_item = table.horizontalHeaderItem(c)
-        if header_item is not None:
-            headers.append(header_item.text())
-        else:
-            headers.append(f"col{c}")
-    data = []
-    for r in range(rows):
-        row = []
-        for c in range(cols):
-            it = table.item(r, c)
-            row.append("" if it is None else it.text())
-        data.append(row)
-    return pd.DataFrame(data, columns=headers)
+def table_to_df(table: QTableView) -> pd.DataFrame:
+    model = table.model()
+    if isinstance(model, DataFrameModel):
+        return model.dataframe()
+    import pandas as pd
+
+    return pd.DataFrame()
+
+
+def read_max_assignments_df(path: Path) -> pd.DataFrame | None:
+    """
+    勤務回数上限 CSV(Name,<病院...>)を列型を指定して読み込む。
+    ヘッダが想定外、または整数以外の値が含まれる場合は None を返す(汎用読み込みに任せる)。
+    """
+    import pandas as pd
+
+    cols = pd.read_csv(path, nrows=0).columns
+    if len(cols) == 0 or cols[0] != "Name":
+        return None
+    dtype = {cols[0]: "string"} | dict.fromkeys(cols[1:], "Int64")
+    try:
+        return pd.read_csv(path, dtype=dtype, engine="c", na_values=[""])
+    except (TypeError, ValueError):
+        return None
 
 
 def backup(path: Path) -> None:
     if path.exists():
-        bak = path.with_suffix(path.suffix + ".bak")
-        bak.write_text(path.read_text(encoding="utf-8-sig"), encoding="utf-8-sig")
+        # 文字コードを介さずバイト列のまま複製する(BOM・改行もそのまま)
+        shutil.copyfile(path, path.with_suffix(path.suffix + ".bak"))
 
 
 # -------- メイン処理タブ --------
@@ -131,8 +303,14 @@ class MainTab(QWidget):
         self.btn_open = QPushButton("勤務希望csv選択")  # ← 文言変更
         self.btn_run = QPushButton("処理実行")
         self.btn_save = QPushButton("勤務表Excel出力")  # ← 文言変更
-        self.table = QTableWidget()
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.log_model = LogModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.log_model)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # 列幅は行追加のたびに測り直さずヘッダ側に任せる
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setStretchLastSection(True)
 
         top = QHBoxLayout()
         top.addWidget(self.input_label, 1)
@@ -151,38 +329,39 @@ class MainTab(QWidget):
 
         self.result_df: pd.DataFrame | None = None
 
+        # ログは溜めてまとめて表に反映する(1行ごとの再描画を避ける)
+        self._pending_logs: list[tuple[str, str, QColor | None]] = []
+        self._flush_scheduled = False
+        self._last_flush = 0.0
+
     def log_append(self, message: str, color: str | None = None) -> None:
         """ログメッセージをテーブルに追加"""
-        current_rows = self.table.rowCount()
-        self.table.setRowCount(current_rows + 1)
-
         # 時刻を追加
-        import datetime
-
-        from PySide6.QtGui import QColor
-
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        time_item = QTableWidgetItem(timestamp)
-        message_item = QTableWidgetItem(message)
-
         # 色指定がある場合はテキスト色を設定
-        if color:
-            message_item.setForeground(QColor(color))
-
-        # 2列のテーブルにする
-        if self.table.columnCount() == 0:
-            self.table.setColumnCount(2)
-            self.table.setHorizontalHeaderLabels(["時刻", "メッセージ"])
-
-        self.table.setItem(current_rows, 0, time_item)
-        self.table.setItem(current_rows, 1, message_item)
-        self.table.resizeColumnsToContents()
+        self._pending_logs.append((timestamp, message, QColor(color) if color else None))
+
+        # 前回の反映から間が空いていればすぐ反映し、そうでなければタイマーで後からまとめて反映
+        if time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL_MS / 1000:
+            self._flush_logs()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(LOG_FLUSH_INTERVAL_MS, self._flush_logs)
+
+    def _flush_logs(self) -> None:
+        """溜まっているログを表に反映する"""
+        self._flush_scheduled = False
+        if not self._pending_logs:
+            return
+        rows, self._pending_logs = self._pending_logs, []
+        self.log_model.extend(rows)
 
         # 最新行にスクロール
         self.table.scrollToBottom()
 
         # UIを更新
         QApplication.processEvents()
+        self._last_flush = time.monotonic()
 
     def choose_input(self) -> None:
         # CSV のみ選択可能に
@@ -202,17 +381,19 @@ class MainTab(QWidget):
 
             import pulp
 
-            from src.calendar.utils import generate_monthly_dates
+            from src.calendar.utils import (
+                generate_monthly_dates,
+                holidays_in,
+                last_holidays_in,
+            )
             from src.constraints.autoimport import auto_import_all
             from src.constraints.base import all_constraints
-            from src.domain.context import Context
-            from src.domain.types import Weekday
+            from src.domain.context import Context, build_day_index, build_var_index
             from src.io.hospitals_loader import load_hospitals
             from src.io.max_assignments_loader import load_max_assignments_csv
             from src.io.preferences_loader import load_preferences_csv
             from src.io.specified_days_loader import load_specified_days
             from src.io.workers_loader import load_workers
-            from src.model.demand import compute_required_hd
             from src.model.variable_builder import VariableBuilder
             from src.optimizer.objective import set_two_stage_objective
             from src.optimizer.penalty_report import (
@@ -264,12 +445,11 @@ class MainTab(QWidget):
             # 3. 変数生成
             self.log_append("最適化変数を生成中...")
             vb = VariableBuilder(hospitals=hospitals, workers=workers, days=days)
-            vb.init_all_zero()
             vb.elevate_by_workers(workers)
             vb.restrict_by_hospitals(hospitals, specified_days)
             vb.filter_by_max_assignments(max_assignments)
             x = vb.materialize(name="x")
-            required_hd = compute_required_hd(hospitals, days, list(Weekday), specified_days)
+            required_hd = set(vb.required_map_for(hospitals, specified_days))
 
             # 4. モデル&ctx
             self.log_append("最適化モデルを構築中...")
@@ -283,7 +463,11 @@ class MainTab(QWidget):
                 max_assignments=max_assignments,
                 required_hd=required_hd,
                 variables=x,
+                holidays=holidays_in(days),
+                last_holidays=last_holidays_in(days),
             )
+            build_var_index(ctx, x)
+            build_day_index(ctx)
 
             # 5. 制約適用
             self.log_append("制約条件を適用中...")
@@ -298,7 +482,17 @@ class MainTab(QWidget):
 
             # 7. 解く
             self.log_append("最適化を実行中...")
-            res = solve(model, x, ctx, build_objective=False)
+            # 求解中はイベントループが回らないので、ここまでのログは先に出しておく
+            self._flush_logs()
+            # 前回の結果があれば初期解として渡す(キーが一致しない変数は無視される)
+            prev = getattr(self, "solve_result", None)
+            res = solve(
+                model,
+                x,
+                ctx,
+                build_objective=False,
+                initial_assignment=prev.assignment if prev else None,
+            )
 
             # 8. 結果をログに表示
             self.log_append(f"最適化完了: {res.status}")
@@ -311,7 +505,7 @@ class MainTab(QWidget):
                 self.log_append("⚠️ 人員不足が検出されました:", color="#DC143C")
                 for (hospital, d), shortage in sorted(res.shortage_slack.items()):
                     self.log_append(
-                        f"  {d.isoformat()} {hospital}: {int(shortage)}人不足", color="#DC143C"
+                        f"  {d.isoformat()} {hospital}: {round(shortage)}人不足", color="#DC143C"
                     )
 
             if res.penalty_by_source:
@@ -324,28 +518,26 @@ class MainTab(QWidget):
                 self.log_append("制約別ペナルティ詳細:", color="#FF8C00")
                 penalty_rows = list(_iter_penalty_rows(ctx))
 
-                # 制約別集計
-                from collections import defaultdict
-
-                by_constraint = defaultdict(list)
+                # 制約別集計(合計も同じ走査で求める)
+                by_constraint: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+                totals: defaultdict[str, float] = defaultdict(float)
                 for row in penalty_rows:
                     if row["penalty"] and row["penalty"] > 0:
                         by_constraint[row["summary"]].append(row)
+                        totals[row["summary"]] += row["penalty"]
 
                 # 各制約について上位項目を表示
-                for constraint_name, items in sorted(
-                    by_constraint.items(),
-                    key=lambda x: sum(item["penalty"] for item in x[1]),
-                    reverse=True,
+                for constraint_name, total_penalty in sorted(
+                    totals.items(), key=lambda kv: kv[1], reverse=True
                 ):
-                    total_penalty = sum(item["penalty"] for item in items)
+                    items = by_constraint[constraint_name]
                     self.log_append(
                         f"  [{constraint_name}] 合計: {total_penalty:.1f}", color="#FF8C00"
                     )
 
-                    # 各制約の上位5項目を表示
-                    sorted_items = sorted(items, key=lambda x: x["penalty"], reverse=True)[:5]
-                    for item in sorted_items:
+                    # 各制約の上位5項目を表示(全件は並べ替えない)
+                    top_items = heapq.nlargest(5, items, key=lambda x: x["penalty"])
+                    for item in top_items:
                         meta_str = (
                             ", ".join(f"{k}={v}" for k, v in item["meta"].items())
                             if item["meta"]
@@ -371,8 +563,6 @@ class MainTab(QWidget):
             info(self, "処理が完了しました。")
 
         except Exception as e:
-            import traceback
-
             error_msg = f"処理に失敗しました:\n{e}\n\n{traceback.format_exc()}"
             self.log_append(f"エラー: {e}")
             err(self, error_msg)
@@ -385,13 +575,13 @@ class MainTab(QWidget):
 
         try:
             # 保存先を選択
-            from datetime import datetime
-
             # デフォルトファイル名を生成
             first_date = next(iter(self.solve_result.assignment.keys()))[2]
             year = first_date.year
             month = first_date.month
-            default_name = f"schedule_{year}_{month:02d}_{datetime.now().strftime('%H%M%S')}.xlsx"
+            default_name = (
+                f"schedule_{year}_{month:02d}_{datetime.datetime.now().strftime('%H%M%S')}.xlsx"
+            )
 
             file_path, _ = QFileDialog.getSaveFileName(
                 self, "勤務表を保存", default_name, "Excel files (*.xlsx);;All files (*)"
@@ -419,8 +609,6 @@ class MainTab(QWidget):
             info(self, f"勤務表を保存しました:\n{file_path}")
 
         except Exception as e:
-            import traceback
-
             error_msg = f"Excel出力に失敗しました:\n{e}\n\n{traceback.format_exc()}"
             self.log_append(f"Excel出力エラー: {e}")
             err(self, error_msg)
@@ -453,7 +641,7 @@ class SettingsTab(QWidget):
         top.addWidget(self.btn_save)
 
         # 編集領域(CSV は table、TOML/JSON は editor)
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.editor = QPlainTextEdit()
         self.table.hide()
         self.editor.hide()
@@ -472,6 +660,8 @@ class SettingsTab(QWidget):
 
         # 状態
         self.path: Path | None = None
+        # 最後に構文検証を通したテキスト(拡張子, ハッシュ)。同じ内容なら再検証しない
+        self._validated_key: tuple[str, int] | None = None
 
         # シグナル
         self.btn_open.clicked.connect(self.open_config_dialog)
@@ -483,33 +673,26 @@ class SettingsTab(QWidget):
 
     def setup_table_editing(self) -> None:
         """テーブル編集機能をセットアップ"""
-        from PySide6.QtCore import QEvent
-        from PySide6.QtGui import QKeyEvent
 
         def handle_key_press(event: QKeyEvent) -> bool:
             """キーボードイベントを処理"""
             # Delete または Backspace キーでセルを空にする
             if event.key() in (Qt.Key.Key_Delete, Qt.Key.Key_Backspace):
-                current_item = self.table.currentItem()
-                if current_item is not None:
-                    current_item.setText("")
+                index = self.table.currentIndex()
+                model = self.table.model()
+                if index.isValid() and model is not None:
+                    model.setData(index, "", Qt.ItemDataRole.EditRole)
                     return True
             return False
 
         # イベントフィルターを設定
-        from PySide6.QtCore import QObject
-
         class EventFilter(QObject):
-            def __init__(self, table_widget: QTableWidget) -> None:
+            def __init__(self, table_widget: QTableView) -> None:
                 super().__init__()
                 self.table_widget = table_widget
 
             def eventFilter(self, obj: QObject, event: QEvent) -> bool:
                 if event.type() == QEvent.Type.KeyPress and obj == self.table_widget:
-                    from typing import cast
-
-                    from PySide6.QtGui import QKeyEvent
-
                     return handle_key_press(cast(QKeyEvent, event))
                 return False
 
@@ -557,10 +740,21 @@ class SettingsTab(QWidget):
 
             ext = path.suffix.lower()
             if ext == ".csv":
-                df = pd.read_csv(path)
-                # 整数表示・保存のための型揃え(存在すれば)
-                with contextlib.suppress(NameError):
-                    df = coerce_int_columns(df)
+                # 勤務回数上限 CSV は列型が決まっているので推論・型揃えを省く
+                typed = (
+                    read_max_assignments_df(path)
+                    if path.resolve() == MAX_ASSIGNMENTS_PATH.resolve()
+                    else None
+                )
+                if typed is not None:
+                    df = typed
+                else:
+                    import pandas as pd
+
+                    df = pd.read_csv(path)
+                    # 整数表示・保存のための型揃え(存在すれば)
+                    with contextlib.suppress(NameError):
+                        df = coerce_int_columns(df)
                 df_to_table(self.table, df)
                 # Name を行ヘッダに(存在すれば)
                 # Note: apply_name_as_row_header function is not implemented
@@ -573,30 +767,42 @@ class SettingsTab(QWidget):
 
             elif ext in {".toml", ".tml"}:
                 txt = path.read_text(encoding="utf-8")
-                tomlkit.parse(txt)  # 構文検証
+                self._validate_text(ext, txt)  # 構文検証
                 self.editor.setPlainText(txt)
+                self._validated_key = (ext, hash(self.editor.toPlainText()))
                 self.editor.show()
                 self.table.hide()
 
             else:  # JSON
                 txt = path.read_text(encoding="utf-8")
-                json.loads(txt)  # 構文検証
+                self._validate_text(ext, txt)  # 構文検証
                 self.editor.setPlainText(txt)
+                self._validated_key = (ext, hash(self.editor.toPlainText()))
                 self.editor.show()
                 self.table.hide()
 
         except Exception as e:
             _err(self, f"読み込みに失敗しました:\n{e}\n\n{traceback.format_exc()}")
 
+    def _validate_text(self, ext: str, txt: str) -> None:
+        """TOML/JSON の構文検証。直前に検証済みの内容と同じなら解析を省く"""
+        key = (ext, hash(txt))
+        if key == self._validated_key:
+            return
+        if ext in {".toml", ".tml"}:
+            # 検証だけなら書式を保つ必要はないので、軽い標準ライブラリの tomllib で解析する
+            tomllib.loads(txt)
+        else:
+            json.loads(txt)
+        self._validated_key = key
+
     def save_config(self) -> None:
         if not self.path:
             _err(self, "保存する設定ファイルを先に選んでください。")
             return
         try:
             # .bak 退避
-            if self.path.exists():
-                bak = self.path.with_suffix(self.path.suffix + ".bak")
-                bak.write_text(self.path.read_text(encoding="utf-8"), encoding="utf-8")
+            backup(self.path)
 
             ext = self.path.suffix.lower()
             if ext == ".csv":
@@ -607,12 +813,12 @@ class SettingsTab(QWidget):
 
             elif ext in {".toml", ".tml"}:
                 txt = self.editor.toPlainText()
-                tomlkit.parse(txt)  # 構文検証
+                self._validate_text(ext, txt)  # 構文検証
                 self.path.write_text(txt, encoding="utf-8")
 
             else:  # JSON
                 txt = self.editor.toPlainText()
-                json.loads(txt)  # 構文検証
+                self._validate_text(ext, txt)  # 構文検証
                 self.path.write_text(txt, encoding="utf-8")
 
             _info(self, "保存しました。(.bak を作成)")
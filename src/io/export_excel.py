@@ -1,19 +1,44 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Final, cast
+from collections import defaultdict
+from typing import BinaryIO, Final
 
 from openpyxl import Workbook
-from openpyxl.cell.cell import Cell
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.worksheet import Worksheet
 
-from src.calendar.utils import is_holiday_or_weekend
+from src.calendar.utils import WEEKDAY_LIST, is_holiday_or_weekend
 from src.domain.context import VarKey
-from src.domain.types import ShiftType, Weekday
+from src.domain.types import ShiftType
 
 SEPARATOR: Final[str] = ","  # セル内で複数人を区切る文字列
+# 名前の後ろに付けるシフト表記(日勤・当直は付けない)
+_SHIFT_SUFFIX: Final[dict[ShiftType, str]] = {ShiftType.AM: "AM", ShiftType.PM: "PM"}
+
+_CENTER: Final = Alignment(horizontal="center", vertical="center", wrap_text=True)
+_LEFT: Final = Alignment(horizontal="left", vertical="center", wrap_text=True)
+_BORDER: Final = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+_HOLIDAY_FILL: Final = PatternFill(fill_type="solid", start_color="FFF4CC", end_color="FFF4CC")
+_SHORTAGE_FILL: Final = PatternFill(fill_type="solid", start_color="FF9999", end_color="FF9999")
+
+
+def _named_styles() -> list[NamedStyle]:
+    """勤務表で使う書式一式(NamedStyle はブックに結び付くのでブックごとに作る)"""
+    return [
+        NamedStyle(name="header", font=Font(bold=True), alignment=_CENTER, border=_BORDER),
+        NamedStyle(name="label", alignment=_CENTER, border=_BORDER),
+        NamedStyle(name="label_holiday", alignment=_CENTER, border=_BORDER, fill=_HOLIDAY_FILL),
+        NamedStyle(name="body", alignment=_LEFT, border=_BORDER),
+        NamedStyle(name="body_holiday", alignment=_LEFT, border=_BORDER, fill=_HOLIDAY_FILL),
+        NamedStyle(name="body_shortage", alignment=_LEFT, border=_BORDER, fill=_SHORTAGE_FILL),
+    ]
 
 
 def export_schedule_to_excel(
@@ -22,16 +47,12 @@ def export_schedule_to_excel(
     shortage_slack: dict[tuple[str, dt.date], float] | None = None,
     days: list[dt.date],
     hospital_names: list[str],
-    out_path: str,
+    out_path: str | BinaryIO,
 ) -> None:
-    wb = Workbook()
-
-    ws_like = wb.active
-    # None/Chartsheet の可能性を潰す
-    if not isinstance(ws_like, Worksheet):
-        ws_like = wb.create_sheet(title="勤務表")
-    ws: Worksheet = cast(Worksheet, ws_like)
-    ws.title = "勤務表"
+    """勤務表を Excel に書き出す(out_path はパスのほか BytesIO などのバイナリストリームも可)"""
+    # 行ごとにセルを組み立てて append する(セル単位の書き込み・再スタイルを避ける)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="勤務表")
 
     # 列幅・見た目
     ws.column_dimensions["A"].width = 12
@@ -39,68 +60,59 @@ def export_schedule_to_excel(
     for idx in range(len(hospital_names)):
         col_letter = get_column_letter(3 + idx)
         ws.column_dimensions[col_letter].width = 10
+    ws.freeze_panes = "C2"
 
-    bold = Font(bold=True)
-    center = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    left = Alignment(horizontal="left", vertical="center", wrap_text=True)
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-    holiday_fill = PatternFill(fill_type="solid", start_color="FFF4CC", end_color="FFF4CC")
-    shortage_fill = PatternFill(fill_type="solid", start_color="FF9999", end_color="FF9999")
+    # 書式は NamedStyle としてブックに一度だけ登録し、セルには名前だけを設定する
+    for named in _named_styles():
+        wb.add_named_style(named)
 
-    # 見出し
-    a1: Cell = ws.cell(row=1, column=1, value="日付")
-    b1: Cell = ws.cell(row=1, column=2, value="曜日")
-    a1.font = bold
-    b1.font = bold
-    a1.alignment = center
-    b1.alignment = center
+    def make_cell(value: str, style: str) -> Cell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
 
-    for j, hname in enumerate(hospital_names, start=3):
-        cell: Cell = ws.cell(row=1, column=j, value=hname)
-        cell.font = bold
-        cell.alignment = center
-
-    weekday_list: list[Weekday] = list(Weekday)
+    # 見出し
+    ws.append([make_cell(v, "header") for v in ("日付", "曜日", *hospital_names)])
 
-    cell_values: dict[tuple[dt.date, str], list[str]] = {}
+    # (日付, 病院) は添字の組で引く
+    day_index = {d: i for i, d in enumerate(days)}
+    hosp_index = {h: j for j, h in enumerate(hospital_names)}
+    cell_values: defaultdict[tuple[int, int], list[str]] = defaultdict(list)
     for (h, w, d, s), v in assignment.items():
         if v == 0:
             continue
-        suffix = "AM" if s == ShiftType.AM else "PM" if s == ShiftType.PM else ""
+        i, j = day_index.get(d), hosp_index.get(h)
+        if i is None or j is None:
+            continue  # 出力対象外の日付・病院
+        suffix = _SHIFT_SUFFIX.get(s, "")
         label = f"{w}{suffix}".strip()  # 例: "IVR01AM", "診断05PM", "治療02"
-        cell_values.setdefault((d, h), []).append(label)
+        cell_values[i, j].append(label)
+
+    # 日ごとの表示値・休日判定と人手不足セルは行ループの前に一度だけ求める
+    holiday_flags = [is_holiday_or_weekend(d) for d in days]
+    date_labels = [d.isoformat() for d in days]
+    weekday_labels = [WEEKDAY_LIST[d.weekday()].value for d in days]
+    shortage_cells = {
+        (day_index[d], hosp_index[h])
+        for h, d in shortage_slack or ()
+        if d in day_index and h in hosp_index
+    }
 
     # 本体行
-    for i, d in enumerate(days, start=2):
-        c_date = ws.cell(row=i, column=1, value=d.isoformat())
-        c_date.alignment = center
-        jp_weekday = weekday_list[d.weekday()].value
-        c_wd = ws.cell(row=i, column=2, value=jp_weekday)
-        c_wd.alignment = center
-
-        for j, hname in enumerate(hospital_names, start=3):
-            labels = cell_values.get((d, hname), [])
+    for i, is_holiday in enumerate(holiday_flags):
+        # 土日祝は行全体を塗る(人手不足の色より優先)
+        label_style = "label_holiday" if is_holiday else "label"
+        row = [make_cell(date_labels[i], label_style), make_cell(weekday_labels[i], label_style)]
+        for j in range(len(hospital_names)):
+            labels = cell_values.get((i, j), [])
             txt = SEPARATOR.join(labels)
-            cell = ws.cell(row=i, column=j, value=txt)
-            cell.alignment = left
-            # 人手不足があれば色付け
-            if shortage_slack and (hname, d) in shortage_slack:
-                cell.fill = shortage_fill
+            if is_holiday:
+                style = "body_holiday"
+            elif (i, j) in shortage_cells:
+                style = "body_shortage"  # 人手不足があれば色付け
+            else:
+                style = "body"
+            row.append(make_cell(txt, style))
+        ws.append(row)
 
-        if is_holiday_or_weekend(d):  # -> bool を返すよう定義側も注釈
-            for col in range(1, 3 + len(hospital_names)):
-                ws.cell(row=i, column=col).fill = holiday_fill
-
-        for col in range(1, 3 + len(hospital_names)):
-            ws.cell(row=i, column=col).border = border
-
-    for col in range(1, 3 + len(hospital_names)):
-        ws.cell(row=1, column=col).border = border
-
-    ws.freeze_panes = "C2"
     wb.save(out_path)
@@ -1,6 +1,5 @@
-import tomllib
-
 from src.domain.types import Frequency, Hospital, HospitalDemandRule, ShiftType, Weekday
+from src.io.toml_cache import load_toml
 
 
 def load_hospitals(config_path: str) -> list[Hospital]:
@@ -13,32 +12,21 @@ def load_hospitals(config_path: str) -> list[Hospital]:
         List[Hospital]: Parsed configuration data.
     """
 
-    data = []
-
-    with open(config_path, "rb") as f:
-        config = tomllib.loads(f.read().decode("utf-8-sig"))
-        for hospital in config.get("hospitals", []):
-            name = hospital["name"]
-            is_remote = hospital.get("is_remote", False)
-            is_university = hospital.get("is_university", False)
-            shifts = []
-            for shift in hospital.get("shifts", []):
-                shift_type = ShiftType(shift["shift_type"])
-                weekdays = [Weekday(day) for day in shift.get("weekdays", [])]
-                frequency = Frequency(shift.get("frequency", "毎週"))
-                shifts.append(
-                    HospitalDemandRule(
-                        shift_type=shift_type, weekdays=weekdays, frequency=frequency
-                    )
+    config = load_toml(config_path)
+
+    return [
+        Hospital(
+            name=hospital["name"],
+            is_remote=hospital.get("is_remote", False),
+            is_university=hospital.get("is_university", False),
+            demand_rules=[
+                HospitalDemandRule(
+                    shift_type=ShiftType(shift["shift_type"]),
+                    weekdays=[Weekday(day) for day in shift.get("weekdays", [])],
+                    frequency=Frequency(shift.get("frequency", "毎週")),
                 )
-            data.append(
-                Hospital(
-                    name=name,
-                    is_remote=is_remote,
-                    is_university=is_university,
-                    demand_rules=shifts,
-                )
-            )
-            # print(f"Loaded config for hospital: {name}")
-
-    return data
+                for shift in hospital.get("shifts", [])
+            ],
+        )
+        for hospital in config.get("hospitals", [])
+    ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import sys
 
 
 def load_max_assignments_csv(path: str) -> dict[tuple[str, str], int | None]:
@@ -24,31 +25,41 @@ def load_max_assignments_csv(path: str) -> dict[tuple[str, str], int | None]:
         if not headers or headers[0].strip() != "Name":
             raise ValueError("ヘッダの先頭は 'Name' である必要があります。")
 
-        hospitals = [h.strip() for h in headers[1:]]
+        # キーの文字列は intern して共有する(ハッシュ・比較も速くなる)
+        hospitals = [sys.intern(h.strip()) for h in headers[1:]]
+        ncols = len(hospitals)
+        # セルの値は "", "0", "1" など少数の種類しか出ないので、文字列→上限値を使い回す
+        parsed: dict[str, int | None] = {"": None}
 
         for row_idx, row in enumerate(reader, start=2):  # 行番号を持っておくとエラー時に便利
             if not row:
                 continue
-            name = (row[0] or "").strip()
+            name = sys.intern((row[0] or "").strip())
             if name == "":
                 continue
 
-            for col, hosp in enumerate(hospitals, start=1):
-                raw = (row[col] if col < len(row) else "").strip()
-                if raw == "":
-                    cap: int | None = None
-                else:
-                    try:
-                        cap = int(raw)
-                        if cap < 0:
-                            raise ValueError(
-                                f"{path}:{row_idx}行目 {hosp}列: 負の値 {cap} は無効です"
-                            )
-                    except ValueError as e:
-                        raise ValueError(
-                            f"{path}:{row_idx}行目 {hosp}列: "
-                            f"数値または空欄を期待しましたが '{raw}' が見つかりました"
-                        ) from e
+            cells = row[1 : ncols + 1]
+            if len(cells) < ncols:
+                cells += [""] * (ncols - len(cells))
+            for hosp, cell in zip(hospitals, cells, strict=True):
+                raw = cell.strip()
+                cap = parsed.get(raw, -1)
+                if cap == -1:
+                    cap = _parse_cap(raw, path, row_idx, hosp)
+                    parsed[raw] = cap
                 result[(name, hosp)] = cap
 
     return result
+
+
+def _parse_cap(raw: str, path: str, row_idx: int, hosp: str) -> int:
+    try:
+        cap = int(raw)
+        if cap < 0:
+            raise ValueError(f"{path}:{row_idx}行目 {hosp}列: 負の値 {cap} は無効です")
+    except ValueError as e:
+        raise ValueError(
+            f"{path}:{row_idx}行目 {hosp}列: "
+            f"数値または空欄を期待しましたが '{raw}' が見つかりました"
+        ) from e
+    return cap
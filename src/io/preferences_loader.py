@@ -17,6 +17,27 @@ class PreferenceStatus(str, Enum):
 
 _WANTS_NIGHT = "当直希望"
 
+# (当直希望の有無) -> セルの値 -> PreferenceStatus
+# 表に無い値は制限なしとして扱う
+_STATUS_BY_CELL: dict[bool, dict[str, PreferenceStatus]] = {
+    False: {
+        # セルの値が空白かつ当直希望なし -> 制限なし
+        "": PreferenceStatus.NONE,
+        PreferenceStatus.NONE.value: PreferenceStatus.NONE,
+        # セルの値が"当直不可" -> 当直不可
+        PreferenceStatus.NIGHT_FORBIDDEN.value: PreferenceStatus.NIGHT_FORBIDDEN,
+        # セルの値が"日勤・当直不可" -> 日勤・当直不可
+        PreferenceStatus.DAY_NIGHT_FORBIDDEN.value: PreferenceStatus.DAY_NIGHT_FORBIDDEN,
+    },
+    True: {
+        # セルの値が空白かつ当直希望あり -> 当直不可
+        "": PreferenceStatus.NIGHT_FORBIDDEN,
+        PreferenceStatus.NONE.value: PreferenceStatus.NIGHT_FORBIDDEN,
+        PreferenceStatus.NIGHT_FORBIDDEN.value: PreferenceStatus.NIGHT_FORBIDDEN,
+        PreferenceStatus.DAY_NIGHT_FORBIDDEN.value: PreferenceStatus.DAY_NIGHT_FORBIDDEN,
+    },
+}
+
 # 例: "2025年10月 勤務希望 [10/1(水)]"
 _DATE_HEAD_RE = re.compile(r"(\d{4})年(\d{1,2})月.*\[(\d{1,2})/(\d{1,2})")
 
@@ -70,50 +91,29 @@ def load_preferences_csv(path: str) -> dict[tuple[str, dt.date], PreferenceStatu
         if not date_cols:
             raise ValueError("日付ヘッダ(例: '2025年10月 勤務希望 [10/1(水)]')が見つかりません。")
 
-        row_list = list(reader)
-        # 1パス目: 当直希望の有無を集計
+        # 1パス目: 氏名と日付セルを一度だけ strip して保持し、当直希望の有無も集計
+        rows: list[tuple[str, list[str]]] = []
         wants_night: dict[str, bool] = defaultdict(bool)
-        for row in row_list:
+        for row in reader:
             if not row or len(row) <= name_col:
                 continue
             worker = (row[name_col] or "").strip()
             if worker == "":
                 continue
 
-            for col_idx, _ in date_cols:
-                val = (row[col_idx] if col_idx < len(row) else "").strip()
-                if val == _WANTS_NIGHT:
-                    wants_night[worker] = True
+            n = len(row)
+            cells = [(row[col_idx] if col_idx < n else "").strip() for col_idx, _ in date_cols]
+            if _WANTS_NIGHT in cells:
+                wants_night[worker] = True
+            rows.append((worker, cells))
 
         # 2パス目: セルごとに"制限なし" or "当直不可" or "日勤・当直不可"を確定
-        for row in row_list:
-            if not row or len(row) <= name_col:
-                continue
-            worker = (row[name_col] or "").strip()
-            if worker == "":
-                continue
-
-            for col_idx, d in date_cols:
-                val = (row[col_idx] if col_idx < len(row) else "").strip()
-                match (val, wants_night[worker]):
-                    # セルの値が空白かつ当直希望なし -> 制限なし
-                    case ("", False) | (PreferenceStatus.NONE.value, False):
-                        status = PreferenceStatus.NONE
-                    # セルの値が空白かつ当直希望あり -> 当直不可
-                    case ("", True) | (PreferenceStatus.NONE.value, True):
-                        status = PreferenceStatus.NIGHT_FORBIDDEN
-                    # セルの値が"当直不可" -> 当直不可
-                    case (PreferenceStatus.NIGHT_FORBIDDEN.value, _):
-                        status = PreferenceStatus.NIGHT_FORBIDDEN
-                    # セルの値が"日勤・当直不可" -> 日勤・当直不可
-                    case (PreferenceStatus.DAY_NIGHT_FORBIDDEN.value, _):
-                        status = PreferenceStatus.DAY_NIGHT_FORBIDDEN
-                    # その他の値
-                    case (_, _):
-                        # 未知の文言は安全側で無視(=制限なし)
-                        # "当直希望"もここに含まれる
-                        status = PreferenceStatus.NONE
-                result[(worker, d)] = status
+        for worker, cells in rows:
+            # 当直希望の有無で表を選び、セルごとは辞書を1回引くだけにする
+            table = _STATUS_BY_CELL[wants_night[worker]]
+            for (_, d), val in zip(date_cols, cells, strict=True):
+                # 未知の文言は安全側で無視(=制限なし)。"当直希望"もここに含まれる
+                result[(worker, d)] = table.get(val, PreferenceStatus.NONE)
 
     return result
 
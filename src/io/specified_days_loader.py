@@ -1,4 +1,4 @@
-import tomllib
+from src.io.toml_cache import load_toml
 
 
 def load_specified_days(config_path: str) -> dict[str, list[int]]:
@@ -10,13 +10,13 @@ def load_specified_days(config_path: str) -> dict[str, list[int]]:
         dict[str, List[int]]: Parsed configuration data.
     """
 
-    with open(config_path, "rb") as f:
-        config = tomllib.loads(f.read().decode("utf-8-sig"))
-        specified_days = dict()
-        for hospital in config.get("hospitals", []):
-            name = hospital.get("name")
-            days = hospital.get("dates", [])
-            if name:
-                specified_days[name] = days
+    config = load_toml(config_path)
+    specified_days = dict()
+    for hospital in config.get("hospitals", []):
+        name = hospital.get("name")
+        # キャッシュされた解析結果を共有しないようリストは複製する
+        days = list(hospital.get("dates", []))
+        if name:
+            specified_days[name] = days
 
     return specified_days
@@ -0,0 +1,29 @@
+import functools
+import os
+import tomllib
+from typing import Any
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_toml(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    # mtime_ns / size はキャッシュキーとしてのみ使う(ファイルが更新されたら読み直す)
+    with open(path, "rb") as f:
+        # Excel 等で保存された BOM 付き UTF-8 も読めるよう utf-8-sig で decode する
+        return tomllib.loads(f.read().decode("utf-8-sig"))
+
+
+def load_toml(config_path: str) -> dict[str, Any]:
+    """TOML ファイルを読み込む。
+
+    同じファイルを更新なしで再度読む場合(GUI での再実行など)は、
+    (パス, 更新時刻, サイズ) をキーにしたキャッシュから解析済みの結果を返す。
+    返り値は共有されるので、呼び出し側で変更しないこと。
+
+    Args:
+        config_path (str): Path to the TOML file.
+
+    Returns:
+        dict[str, Any]: Parsed TOML data.
+    """
+    st = os.stat(config_path)
+    return _parse_toml(os.fspath(config_path), st.st_mtime_ns, st.st_size)
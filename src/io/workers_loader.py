@@ -1,6 +1,5 @@
-import tomllib
-
 from src.domain.types import ShiftType, Weekday, Worker, WorkerAssignmentRule
+from src.io.toml_cache import load_toml
 
 
 def load_workers(config_path: str) -> list[Worker]:
@@ -14,30 +13,29 @@ def load_workers(config_path: str) -> list[Worker]:
     """
     workers: list[Worker] = []
 
-    with open(config_path, "rb") as f:
-        config = tomllib.loads(f.read().decode("utf-8-sig"))
-        for worker in config.get("workers", []):
-            name = worker["name"]
-            is_diagnostic_specialist = worker.get("is_diagnostic_specialist", False)
-            assignments = []
-            for assignment in worker.get("assignments", []):
-                hospital = assignment["hospital"]
-                weekdays = [Weekday(day) for day in assignment.get("weekdays", [])]
-                shift_type = ShiftType(assignment["shift_type"])
-                assignments.append(
-                    WorkerAssignmentRule(
-                        hospital=hospital,
-                        weekdays=weekdays,
-                        shift_type=shift_type,
-                    )
-                )
-            workers.append(
-                Worker(
-                    name=name,
-                    is_diagnostic_specialist=is_diagnostic_specialist,
-                    assignments=assignments,
+    config = load_toml(config_path)
+    for worker in config.get("workers", []):
+        name = worker["name"]
+        is_diagnostic_specialist = worker.get("is_diagnostic_specialist", False)
+        assignments = []
+        for assignment in worker.get("assignments", []):
+            hospital = assignment["hospital"]
+            weekdays = [Weekday(day) for day in assignment.get("weekdays", [])]
+            shift_type = ShiftType(assignment["shift_type"])
+            assignments.append(
+                WorkerAssignmentRule(
+                    hospital=hospital,
+                    weekdays=weekdays,
+                    shift_type=shift_type,
                 )
             )
-            # print(f"Loaded config for worker: {name}")
+        workers.append(
+            Worker(
+                name=name,
+                is_diagnostic_specialist=is_diagnostic_specialist,
+                assignments=assignments,
+            )
+        )
+        # print(f"Loaded config for worker: {name}")
 
     return workers
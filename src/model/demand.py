@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import date
 
 from src.calendar.utils import is_public_holiday
 from src.domain.types import Frequency, Hospital, ShiftType, Weekday
 
+# シフト種別 -> ビット。日ごとの必要シフト集合を int のビットマスクで持つ
+_SHIFT_BITS: dict[ShiftType, int] = {s: 1 << i for i, s in enumerate(ShiftType)}
+
+
+def _shifts_of(mask: int) -> tuple[ShiftType, ...]:
+    return tuple(s for s, bit in _SHIFT_BITS.items() if mask & bit)
+
 
 def compute_required_map(
     hospitals: list[Hospital],
@@ -17,38 +25,60 @@ def compute_required_map(
     例: {("大学", 2025-10-09): {ShiftType.NIGHT}, ...}
     """
     required: dict[tuple[str, date], set[ShiftType]] = {}
+    # 日ごとの曜日・祝日判定は病院・ルールに依らないので一度だけ求める
+    day_weekdays = [weekdays[d.weekday()] for d in days]
+    day_holidays = [is_public_holiday(d) for d in days]
+    # 曜日 -> その曜日の日インデックス(昇順)。祝日を除いた版も用意しておく
+    idx_by_weekday: dict[Weekday, list[int]] = defaultdict(list)
+    workday_idx_by_weekday: dict[Weekday, list[int]] = defaultdict(list)
+    # 日(1..31) -> 日インデックス
+    idx_by_dom: dict[int, list[int]] = defaultdict(list)
+    for i, (d, wd) in enumerate(zip(days, day_weekdays, strict=True)):
+        idx_by_weekday[wd].append(i)
+        if not day_holidays[i]:
+            workday_idx_by_weekday[wd].append(i)
+        idx_by_dom[d.day].append(i)
+    # ビットマスク -> シフト種別(出現したマスクだけ変換する)
+    decoded: dict[int, tuple[ShiftType, ...]] = {}
     for h in hospitals:
-        # 各日ごとの必要シフト集合
-        daily: list[set[ShiftType]] = [set() for _ in days]
+        # 各日ごとの必要シフト集合(ビットマスク)
+        daily = [0] * len(days)
         for rule in h.demand_rules:
             s = rule.shift_type
+            bit = _SHIFT_BITS[s]
+            allowed = rule.weekday_set
+            # 夜勤以外は平日の祝日をスキップする
+            skip_holiday = s != ShiftType.NIGHT
             match rule.frequency:
                 case Frequency.WEEKLY:
-                    for i, d in enumerate(days):
-                        if is_public_holiday(d) and s != ShiftType.NIGHT:
-                            continue
-                        if weekdays[d.weekday()] in rule.weekdays:
-                            daily[i].add(s)
+                    # 該当曜日の日だけを直接たどる
+                    by_weekday = workday_idx_by_weekday if skip_holiday else idx_by_weekday
+                    for wd in allowed:
+                        for i in by_weekday.get(wd, ()):
+                            daily[i] |= bit
                 case Frequency.BIWEEKLY:
                     biweekly_cnt = 0
-                    for i, d in enumerate(days):
+                    for i in range(len(days)):
                         if biweekly_cnt >= 2:
                             break
-                        if is_public_holiday(d) and s != ShiftType.NIGHT:
+                        if skip_holiday and day_holidays[i]:
                             continue
-                        if i >= 7 and (s in daily[i - 7]):
+                        if i >= 7 and (daily[i - 7] & bit):
                             continue
-                        if weekdays[d.weekday()] in rule.weekdays:
-                            daily[i].add(s)
+                        if day_weekdays[i] in allowed:
+                            daily[i] |= bit
                             biweekly_cnt += 1
                 case Frequency.SPECIFIC_DAYS:
                     assert h.name in specified_days, f"{h.name}に指定日がありません。"
-                    for i, d in enumerate(days):
-                        if d.day in specified_days.get(h.name, []):
-                            daily[i].add(s)
-        for i, d in enumerate(days):
-            if daily[i]:
-                required[(h.name, d)] = daily[i]
+                    for dom in set(specified_days.get(h.name, [])):
+                        for i in idx_by_dom.get(dom, ()):
+                            daily[i] |= bit
+        for d, mask in zip(days, daily, strict=True):
+            if mask:
+                shifts = decoded.get(mask)
+                if shifts is None:
+                    shifts = decoded[mask] = _shifts_of(mask)
+                required[(h.name, d)] = set(shifts)
     return required
 
 
@@ -1,6 +1,6 @@
 from collections import defaultdict
+from collections.abc import Iterator
 from datetime import date
-from itertools import product
 
 import pulp
 
@@ -24,19 +24,58 @@ class VariableBuilder:
 
         # VarKey(h,w,d,s) -> 0/1
         self.ub: dict[VarKey, int] = defaultdict(int)
+        # (h,d) -> UB=1 の候補数。ub の更新と同時に保守する
+        self.cand_by_hd: dict[tuple[str, date], int] = defaultdict(int)
+        # restrict_by_hospitals で求めた需要マップ(同じ入力での再計算を避ける)
+        self._required_map: dict[tuple[str, date], set[ShiftType]] | None = None
+        self._required_map_src: tuple[list[Hospital], dict[str, list[int]]] | None = None
 
-    def init_all_zero(self) -> None:
-        for h, w, d, s in product(self.hospitals, self.workers, self.days, self.shift_types):
-            self.ub[VarKey(h.name, w.name, d, s)] = 0
+    def candidate_keys(self) -> Iterator[VarKey]:
+        """UB=1 の(候補になっている)キーを返す"""
+        return (key for key, ub in self.ub.items() if ub == 1)
+
+    def required_map_for(
+        self, hospital_list: list[Hospital], specified_days: dict[str, list[int]]
+    ) -> dict[tuple[str, date], set[ShiftType]]:
+        """
+        compute_required_map の結果を返す。
+        直前と同じ hospital_list / specified_days オブジェクトなら計算済みのものを再利用する。
+        """
+        src = self._required_map_src
+        if (
+            self._required_map is None
+            or src is None
+            or src[0] is not hospital_list
+            or src[1] is not specified_days
+        ):
+            self._required_map = compute_required_map(
+                hospital_list, self.days, self.weekdays, specified_days
+            )
+            self._required_map_src = (hospital_list, specified_days)
+        return self._required_map
 
     def elevate_by_workers(self, worker_list: list[Worker]) -> None:
         """workers.tomlの内容でUBを1にする(候補化)"""
+        # 日付ごとの曜日を一度だけ引き、同じ曜日集合を持つ割当間で対象日リストを使い回す
+        day_weekdays = [self.weekdays[d.weekday()] for d in self.days]
+        days_for: dict[frozenset[Weekday], list[date]] = {}
+        shift_types = set(self.shift_types)
         for w in worker_list:
-            if not w.assignments:
-                continue
-            for a, d in product(w.assignments, self.days):
-                if self.weekdays[d.weekday()] in a.weekdays and a.shift_type in self.shift_types:
-                    self.ub[VarKey(a.hospital, w.name, d, a.shift_type)] = 1
+            for a in w.assignments:
+                if a.shift_type not in shift_types:
+                    continue
+                allowed = a.weekday_set
+                target_days = days_for.get(allowed)
+                if target_days is None:
+                    target_days = [
+                        d for d, wd in zip(self.days, day_weekdays, strict=True) if wd in allowed
+                    ]
+                    days_for[allowed] = target_days
+                for d in target_days:
+                    key = VarKey(a.hospital, w.name, d, a.shift_type)
+                    if self.ub.get(key) != 1:
+                        self.ub[key] = 1
+                        self.cand_by_hd[(a.hospital, d)] += 1
 
     def restrict_by_hospitals(
         self, hospital_list: list[Hospital], specified_days: dict[str, list[int]]
@@ -50,12 +89,16 @@ class VariableBuilder:
                 specified_YYYY_MM.tomlからロード。
                 例: {"病院A": [1, 15], "病院B": [3, 17, 30]}
         """
-        required_map = compute_required_map(hospital_list, self.days, self.weekdays, specified_days)
-        for h, w, d, s in product(hospital_list, self.workers, self.days, self.shift_types):
-            needed = required_map.get((h.name, d), set())
-            key = VarKey(h.name, w.name, d, s)
-            if s not in needed and key in self.ub:
-                self.ub[key] = 0
+        required_map = self.required_map_for(hospital_list, specified_days)
+        hospital_names = {h.name for h in hospital_list}
+        worker_names = {w.name for w in self.workers}
+        # 登録済みのキーだけを見る(新しいエントリは作らない)
+        for key in self.ub:
+            h, w, d, s = key
+            if h not in hospital_names or w not in worker_names:
+                continue
+            if s not in required_map.get((h, d), ()):
+                self._drop(key)
 
     def filter_by_max_assignments(self, max_assignments: dict[tuple[str, str], int | None]) -> None:
         """
@@ -67,27 +110,34 @@ class VariableBuilder:
             max_assignments: (worker, hospital)をキーとした最大勤務可能数の辞書
                 値が0の場合、その組み合わせでの勤務を禁止する
         """
-        for (worker_name, hospital_name), max_count in max_assignments.items():
-            if max_count != 0:
-                continue
-            # 最大勤務数が0の場合、該当する全ての変数をUB=0に設定
-            # 既存のキーのみを対象にして、新しいエントリを作成しないようにする
-            for d, s in product(self.days, self.shift_types):
-                key = VarKey(hospital_name, worker_name, d, s)
-                if key in self.ub:
-                    self.ub[key] = 0
+        banned = {(w, h) for (w, h), max_count in max_assignments.items() if max_count == 0}
+        if not banned:
+            return
+        # 最大勤務数が0の場合、該当する全ての変数をUB=0に設定
+        # 既存のキーのみを対象にして、新しいエントリを作成しないようにする
+        for key in self.ub:
+            if (key.worker, key.hospital) in banned:
+                self._drop(key)
+
+    def _drop(self, key: VarKey) -> None:
+        """登録済みのキーを UB=0 に戻し、候補数を減らす"""
+        if self.ub[key] == 1:
+            self.cand_by_hd[(key.hospital, key.day)] -= 1
+        self.ub[key] = 0
 
     def materialize(self, name: str = "x") -> dict[VarKey, pulp.LpVariable]:
         """UB=1のものだけPuLP変数にする"""
+        # 日付(YYYYMMDD形式)とシフトの名前片は変数ごとに作らず引くだけにする
+        date_tokens: dict[date, str] = {d: d.strftime("%Y%m%d") for d in self.days}
+        shift_tokens = {s: s.value for s in ShiftType}
         x = {}
-        for var_key, ub in self.ub.items():
-            if ub == 1:
-                h, w, d, s = var_key
-                date_token = d.strftime("%Y%m%d")  # YYYYMMDD形式に変換
-                x[VarKey(h, w, d, s)] = pulp.LpVariable(
-                    f"{name}__{h}__{w}__{date_token}__{s.value}",
-                    lowBound=0,
-                    upBound=1,
-                    cat="Binary",
-                )
+        for var_key in self.candidate_keys():
+            h, w, d, s = var_key
+            date_token = date_tokens.get(d) or d.strftime("%Y%m%d")
+            x[var_key] = pulp.LpVariable(
+                f"{name}__{h}__{w}__{date_token}__{shift_tokens[s]}",
+                lowBound=0,
+                upBound=1,
+                cat="Binary",
+            )
         return x
@@ -1,8 +1,21 @@
 import pulp
 
+from src.constraints.penalty_utils import iter_scaled_penalties
 from src.domain.context import Context
 
 
+def _penalty_expression(ctx: Context) -> pulp.LpAffineExpression:
+    """
+    ctx["penalties"] の sum(実効重み * var) を1つの式として作る。
+    項ごとに式オブジェクトを作って足し合わせず、変数 -> 係数 の辞書から一度に組み立てる。
+    """
+    coefs: dict[pulp.LpVariable, float] = {}
+    for (var, _w, _meta, _source), weight in iter_scaled_penalties(ctx):
+        # 同じ変数が複数回現れたら係数を合算する
+        coefs[var] = coefs.get(var, 0.0) + weight
+    return pulp.LpAffineExpression(coefs)
+
+
 def set_two_stage_objective(
     model: pulp.LpProblem, _: pulp.LpAffineExpression, ctx: Context
 ) -> None:
@@ -11,19 +24,13 @@ def set_two_stage_objective(
     stage1. まずスラック(c01)を最小化する=各病院の勤務日に1名の勤務者がいるようにする
     stage2. 次にソフト制約のペナルティを最小化する
     """
-    shortage_slack = ctx.get("shortage_slack", {})
-    s_list = list(shortage_slack.values()) if isinstance(shortage_slack, dict) else []
     # stage1
-    stage1 = pulp.lpSum(s_list) if s_list else pulp.lpSum([])
+    # ctx["shortage_slack"] は (病院, 日) -> スラック変数 の dict(c01 が設定)
+    # 空でも lpSum は 0 になる
+    stage1 = pulp.lpSum(ctx.get("shortage_slack", {}).values())
     # stage2
-    # ここでペナルティの倍率を定義(default: 1.0)
-    scale = ctx.get(
-        "penalty_source_scale",
-        {},
-    )
-    stage2 = 0
-    for var, w, _meta, source in ctx.get("penalties", []):
-        stage2 += float(scale.get(source, 1.0)) * float(w) * var
+    # ペナルティの倍率(ctx["penalty_source_scale"], default: 1.0)は実効重みに織り込み済み
+    stage2 = _penalty_expression(ctx)
     M = 10_000.0
     model.setObjective(stage1 * M + stage2)
 
@@ -35,12 +42,6 @@ def set_objective_with_penalties(
     base_expr: 例) pulp.lpSum(x.values()) など“正の報酬側”
     ctx["penalties"] に入っている式をまとめて差し引いて一度だけ model に設定
     """
-    # ここでペナルティの倍率を定義(default: 1.0)
-    scale = ctx.get(
-        "penalty_source_scale",
-        {},
-    )
-    total_penalty = 0
-    for var, w, _meta, source in ctx.get("penalties", []):
-        total_penalty += float(scale.get(source, 1.0)) * float(w) * var
+    # ペナルティの倍率(ctx["penalty_source_scale"], default: 1.0)は実効重みに織り込み済み
+    total_penalty = _penalty_expression(ctx)
     model += base_expr - total_penalty
@@ -1,24 +1,25 @@
 from __future__ import annotations
 
+import heapq
 from collections import defaultdict
 from collections.abc import Iterable
 from typing import Any
 
-import pulp
 from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 
-from src.constraints.base import all_constraints
+from src.constraints.base import constraint_registry
+from src.constraints.penalty_utils import iter_scaled_penalties
 from src.domain.context import Context
 
 
 def _get_constraint_summary(source: str) -> str:
     """制約のソース名からsummaryを取得"""
-    for constraint in all_constraints():
-        if constraint.name == source:
-            return constraint.summary
-    return source  # 見つからない場合はsource名を返す
+    constraint = constraint_registry.get(source)
+    if constraint is None:
+        return source  # 見つからない場合はsource名を返す
+    return constraint.summary
 
 
 def _iter_penalty_rows(ctx: Context) -> Iterable[dict[str, Any]]:
@@ -27,18 +28,16 @@ def _iter_penalty_rows(ctx: Context) -> Iterable[dict[str, Any]]:
     サポート:
         - ctx["penalties"] に PenaltyItem(var, weight, meta, source) のタプル配列
     """
-    scale = ctx.get("penalty_source_scale", {})
-
-    for item in ctx.get("penalties", []):
+    for item, scaled_weight in iter_scaled_penalties(ctx):
         var, weight, meta, source = item
-        val = pulp.value(var)
+        val = var.varValue
         source_name = source or "unknown"
         yield {
             "source": source_name,
             "summary": _get_constraint_summary(source_name),
             "var_name": getattr(var, "name", str(var)),
             "value": float(val) if val is not None else None,
-            "weight": weight * scale.get(source_name, 1.0),
+            "weight": scaled_weight,
             "penalty": (weight * float(val)) if val is not None else None,
             "meta": meta or {},
         }
@@ -81,9 +80,11 @@ def print_penalties_rich(ctx: Context, top_n: int | None = 30) -> None:
     detail.add_column("Penalty", justify="right")
     detail.add_column("Meta", overflow="fold")
 
-    sorted_rows = sorted(rows, key=lambda r: (r["penalty"]), reverse=True)
+    # 上位 N 件だけ必要なら全件ソートせずに取り出す
     if top_n:
-        sorted_rows = sorted_rows[:top_n]
+        sorted_rows = heapq.nlargest(top_n, rows, key=lambda r: r["penalty"])
+    else:
+        sorted_rows = sorted(rows, key=lambda r: (r["penalty"]), reverse=True)
 
     for i, r in enumerate(sorted_rows, 1):
         meta_str = ", ".join(f"{k}={v}" for k, v in r["meta"].items())
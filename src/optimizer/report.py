@@ -1,8 +1,6 @@
 from collections import defaultdict
 from typing import Any
 
-import pulp
-
 from src.domain.context import Context
 
 
@@ -22,7 +20,7 @@ def summarize_penalties(
             continue
         z = penalty_item.var
         w = float(penalty_item.weight)
-        v = pulp.value(z)
+        v = z.varValue
         p = w * v
         total += p
         by_source[penalty_item.source] += p
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Mapping
 from dataclasses import asdict, dataclass
 from datetime import date
 from typing import Any
@@ -43,18 +44,33 @@ def solve(
     base_objective: pulp.LpAffineExpression | None = None,
     solver: pulp.LpSolver | None = None,
     build_objective: bool = True,
+    initial_assignment: Mapping[VarKey, int] | None = None,
 ) -> SolveResult:
     """
     モデルを解いて結果を返す総合関数。
+    initial_assignment に前回の割当(SolveResult.assignment など)を渡すと、
+    一致するキーの変数に初期値を設定し、CBC に MIP スタートとして渡す。
+    希望の変更などで上下限の外に出た値(upBound=0 の変数に 1 など)は設定しない。
+    MIP スタートを有効にするのは既定の CBC コマンドだけで、solver を渡した場合は
+    初期値を設定するだけなので、必要なら呼び出し側で warmStart=True を指定する。
     """
     # 目的関数の構築
     if build_objective:
         assert base_objective is not None
         set_objective_with_penalties(model, base_objective, ctx)
 
+    # 初期解(MIP スタート)の設定
+    warm_start = False
+    if initial_assignment:
+        for key, var in x.items():
+            v0 = initial_assignment.get(key)
+            # check=False なら範囲外の値は例外にせず False を返す(設定もしない)
+            if v0 is not None and var.setInitialValue(v0, check=False):
+                warm_start = True
+
     # ソルバー選択
     if solver is None:
-        solver = pulp.PULP_CBC_CMD(msg=False)
+        solver = pulp.PULP_CBC_CMD(msg=False, warmStart=warm_start)
 
     # 実行時間計測
     start = time.time()
@@ -65,11 +81,8 @@ def solve(
     status = pulp.LpStatus.get(status_code, str(status_code))
     obj_val = None if model.objective is None else float(pulp.value(model.objective))
 
-    # 割当結果を収集
-    assignment: dict[VarKey, int] = {}
-    for key, var in x.items():
-        v = pulp.value(var) or 0
-        assignment[key] = round(v)
+    # 割当結果を収集(未評価の変数は 0 とみなす)
+    assignment: dict[VarKey, int] = {key: round(var.varValue or 0) for key, var in x.items()}
 
     # ペナルティ集計
     total_pen, by_src, rows = summarize_penalties(ctx)
@@ -80,7 +93,7 @@ def solve(
     shortage_slack_vars = ctx.get("shortage_slack", {})
 
     for (hospital, d), slack_var in shortage_slack_vars.items():
-        slack_value = float(pulp.value(slack_var) or 0)
+        slack_value = float(slack_var.varValue or 0)
         if slack_value > 1e-6:  # 浮動小数点の精度を考慮
             shortage_slack_dict[(hospital, d)] = slack_value
             total_shortage += slack_value
@@ -1,10 +1,74 @@
 import importlib
+import pkgutil
+import re
 import sys
+from types import MappingProxyType
 
+import pulp
 import pytest
 
 import src.constraints.base as base
 
+# プラグインモジュール -> import 時に登録された制約
+_PLUGIN_CACHE: dict[str, list] = {}
+
+
+def _register_plugin(module_path: str) -> list:
+    """
+    制約プラグインをレジストリに登録し、登録された制約を返す。
+    初回だけモジュールを import し直して登録された制約を控えておき、
+    2回目以降は控えた制約を register し直すだけにする(モジュールを再実行しない)。
+    """
+    cached = _PLUGIN_CACHE.get(module_path)
+    if cached is None:
+        saved = dict(base.constraint_registry)
+        base.constraint_registry.clear()
+        sys.modules.pop(module_path, None)
+        importlib.import_module(module_path)
+        cached = _PLUGIN_CACHE[module_path] = list(base.constraint_registry.values())
+        base.constraint_registry.clear()
+        base.constraint_registry.update(saved)
+    for c in cached:
+        base.register(c)
+    return cached
+
+
+@pytest.fixture
+def register_plugin():
+    """
+    制約プラグインを登録する関数を返すフィクスチャ。
+
+    使い方:
+        def test_xxx(register_plugin):
+            register_plugin("src.constraints.c02_no_overlap_same_time")
+            (constraint,) = all_constraints()
+    """
+    return _register_plugin
+
+
+# 制約プラグインのモジュール名(c01_xxx / s01_xxx)。lp_utils などの補助モジュールは含めない
+_PLUGIN_NAME = re.compile(r"[cs]\d{2}_\w+")
+
+
+@pytest.fixture(scope="session")
+def frozen_registry():
+    """
+    constraints 配下の全プラグインを一度だけ読み込んだレジストリの読み取り専用スナップショット。
+    auto_import_all() 後の状態が欲しいテストは、パッケージを走査し直す代わりに
+    base.constraint_registry.update(frozen_registry) で再現する。
+    """
+    import src.constraints as pkg
+
+    snapshot = {}
+    saved = dict(base.constraint_registry)
+    for m in pkgutil.iter_modules(pkg.__path__):
+        if _PLUGIN_NAME.fullmatch(m.name):
+            for c in _register_plugin(f"src.constraints.{m.name}"):
+                snapshot[c.name] = c
+    base.constraint_registry.clear()
+    base.constraint_registry.update(saved)
+    return MappingProxyType(snapshot)
+
 
 def _reset_registry_and_modules(module_paths: list[str] | None = None):
     """レジストリをクリアし、指定モジュールを再importできる状態に戻す"""
@@ -18,7 +82,7 @@ def _reset_registry_and_modules(module_paths: list[str] | None = None):
 @pytest.fixture
 def ensure_constraint():
     """
-    テストごとに制約モジュールを再importし、対象制約を返すフィクスチャ。
+    テストごとにレジストリを空にして対象プラグインだけを登録し、対象制約を返すフィクスチャ。
 
     使い方:
         def test_xxx(ensure_constraint):
@@ -30,9 +94,9 @@ def ensure_constraint():
     """
 
     def _loader(module_path: str, constraint_name: str):
-        # クリアして対象モジュールを再import
-        _reset_registry_and_modules([module_path])
-        importlib.import_module(module_path)
+        # クリアして対象プラグインだけを登録
+        _reset_registry_and_modules()
+        _register_plugin(module_path)
 
         from src.constraints.base import all_constraints
 
@@ -44,3 +108,17 @@ def ensure_constraint():
 
     # 後片付け
     _reset_registry_and_modules()
+
+
+@pytest.fixture(scope="session")
+def lp_solver():
+    """
+    テスト全体で共有するソルバー。
+    highspy が入っていればプロセス内で解ける HiGHS を使い、
+    無ければ CBC(サブプロセス起動)にフォールバックする。
+    テストのモデルは数変数しかないので、スレッドは1本に絞る。
+    """
+    highs = pulp.HiGHS(msg=False, threads=1)
+    if highs.available():
+        return highs
+    return pulp.PULP_CBC_CMD(msg=False, threads=1)
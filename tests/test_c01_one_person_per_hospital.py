@@ -1,5 +1,4 @@
 import datetime as dt
-import importlib
 import sys
 
 import pulp
@@ -10,8 +9,6 @@ def _reset_registry_and_module():
     import src.constraints.base as base
 
     base.constraint_registry.clear()
-    sys.modules.pop("src.constraints.c01_one_person_per_hospital", None)
-    importlib.invalidate_caches()
 
 
 @pytest.fixture(autouse=True)
@@ -25,15 +22,16 @@ def test_plugin_registers_on_import():
     from src.constraints.base import all_constraints
 
     assert all_constraints() == []
+    sys.modules.pop("src.constraints.c01_one_person_per_hospital", None)
     import src.constraints.c01_one_person_per_hospital  # noqa: F401
 
     names = [c.name for c in all_constraints()]
     assert "one_person_per_hospital" in names
 
 
-def test_enforces_exactly_one_per_required_day():
+def test_enforces_exactly_one_per_required_day(lp_solver, register_plugin):
     """required_hd に含まれる (h,d) は、合計ちょうど1人になる。"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
     from src.constraints.base import all_constraints
 
     (constraint,) = all_constraints()
@@ -56,16 +54,16 @@ def test_enforces_exactly_one_per_required_day():
     slack_vars = list(ctx.get("shortage_slack", {}).values())
     m += pulp.lpSum(slack_vars)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert sum(pulp.value(v) for v in x.values()) == 1  # ちょうど1
     # スラック変数は0になるはず(不足なし)
     assert sum(pulp.value(v) for v in slack_vars) == 0
 
 
-def test_non_required_day_is_not_constrained():
+def test_non_required_day_is_not_constrained(lp_solver, register_plugin):
     """required_hd にない (h,d) には制約が張られない。"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
     from src.constraints.base import all_constraints
 
     (constraint,) = all_constraints()
@@ -90,13 +88,13 @@ def test_non_required_day_is_not_constrained():
 
     # 目的関数を設定して解く(制約がないので任意の値を取れる)
     m += 0  # ダミーの目的関数
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
 
-def test_infeasible_when_required_but_no_candidates():
+def test_infeasible_when_required_but_no_candidates(lp_solver, register_plugin):
     """required_hd に (h,d) があるのに、その日の変数が1つも無い場合、スラック変数で補完される。"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
     from src.constraints.base import all_constraints
 
     (constraint,) = all_constraints()
@@ -118,7 +116,7 @@ def test_infeasible_when_required_but_no_candidates():
     slack_vars = list(ctx.get("shortage_slack", {}).values())
     m += pulp.lpSum(slack_vars)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     # 実際の勤務者は0人(d_reqの候補がないため)、スラック変数は1になる(人手不足)
@@ -131,9 +129,9 @@ def test_infeasible_when_required_but_no_candidates():
     assert sum(pulp.value(v) for v in slack_vars) == 1  # 不足分
 
 
-def test_constraint_names_unique_across_days():
+def test_constraint_names_unique_across_days(register_plugin):
     """制約名が日付でユニークになることを確認。"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
     from src.constraints.base import all_constraints
 
     (constraint,) = all_constraints()
@@ -1,6 +1,4 @@
 import datetime as dt
-import importlib
-import sys
 
 import pulp
 import pytest
@@ -12,8 +10,6 @@ def _reset_registry_and_module():
     import src.constraints.base as base
 
     base.constraint_registry.clear()
-    sys.modules.pop("src.constraints.c04_max_assignments_per_worker_hospital", None)
-    importlib.invalidate_caches()
 
 
 @pytest.fixture(autouse=True)
@@ -23,8 +19,8 @@ def _clean():
     _reset_registry_and_module()
 
 
-def test_cap_is_enforced_and_none_is_unbounded():
-    import src.constraints.c04_max_assignments_per_worker_hospital  # noqa: F401
+def test_cap_is_enforced_and_none_is_unbounded(lp_solver, register_plugin):
+    register_plugin("src.constraints.c04_max_assignments_per_worker_hospital")
     from src.constraints.base import all_constraints
 
     (constraint,) = [
@@ -52,7 +48,7 @@ def test_cap_is_enforced_and_none_is_unbounded():
     ctx = {"max_assignments": caps}
     constraint.apply(m, x, ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     # w1 は合計1に抑えられる
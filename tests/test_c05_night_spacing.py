@@ -1,6 +1,4 @@
 import datetime as dt
-import importlib
-import sys
 
 import pulp
 import pytest
@@ -12,8 +10,6 @@ def _reset_registry_and_module():
     import src.constraints.base as base
 
     base.constraint_registry.clear()
-    sys.modules.pop("src.constraints.c05_night_spacing", None)
-    importlib.invalidate_caches()
 
 
 @pytest.fixture(autouse=True)
@@ -23,9 +19,9 @@ def _clean():
     _reset_registry_and_module()
 
 
-def test_no_two_nights_within_5day_window():
+def test_no_two_nights_within_5day_window(lp_solver, register_plugin):
     # 読み込みで register(window_days=5) が走る前提
-    import src.constraints.c05_night_spacing  # noqa: F401
+    register_plugin("src.constraints.c05_night_spacing")
     from src.constraints.base import all_constraints
 
     (constraint,) = [c for c in all_constraints() if c.name == "night_spacing"]
@@ -47,7 +43,7 @@ def test_no_two_nights_within_5day_window():
     ctx = {"days": [d1, d2, d3]}
     constraint.apply(m, x, ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     v = {k: pulp.value(vv) for k, vv in x.items()}
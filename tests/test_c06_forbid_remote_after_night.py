@@ -1,6 +1,4 @@
 import datetime as dt
-import importlib
-import sys
 
 import pulp
 import pytest
@@ -12,8 +10,6 @@ from src.domain.types import Hospital, ShiftType
 
 def _reset_registry_and_module():
     base.constraint_registry.clear()
-    sys.modules.pop("src.constraints.c06_forbid_remote_after_night", None)
-    importlib.invalidate_caches()
 
 
 @pytest.fixture(autouse=True)
@@ -29,8 +25,19 @@ def _get_constraint():
     return cands[0]
 
 
-def test_blocks_remote_day_after_night():
-    import src.constraints.c06_forbid_remote_after_night  # noqa: F401
+def _has_constraint(model, variables, sense, rhs) -> bool:
+    """model に Σ variables (sense) rhs(係数はすべて1)の制約行があるか"""
+    want = {v.name: 1 for v in variables}
+    return any(
+        con.sense == sense
+        and -con.constant == rhs
+        and {v.name: coef for v, coef in con.items()} == want
+        for con in model.constraints.values()
+    )
+
+
+def test_blocks_remote_day_after_night(register_plugin):
+    register_plugin("src.constraints.c06_forbid_remote_after_night")
 
     c = _get_constraint()
 
@@ -51,16 +58,18 @@ def test_blocks_remote_day_after_night():
     ctx = {"days": [d1, d2], "hospitals": [h_local, h_remote]}
 
     c.apply(m, x, ctx)
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
-    assert pulp.LpStatus[status] == "Optimal"
 
-    v_n = pulp.value(x[(h_local.name, w, d1, ShiftType.NIGHT)])
-    v_d = pulp.value(x[(h_remote.name, w, d2, ShiftType.DAY)])
-    assert v_n + v_d <= 1  # 同時不可
+    # 同時不可: x_night + x_remote_day <= 1 の行が張られる
+    assert _has_constraint(
+        m,
+        [x[(h_local.name, w, d1, ShiftType.NIGHT)], x[(h_remote.name, w, d2, ShiftType.DAY)]],
+        pulp.LpConstraintLE,
+        1,
+    )
 
 
-def test_blocks_remote_am_after_night():
-    import src.constraints.c06_forbid_remote_after_night  # noqa: F401
+def test_blocks_remote_am_after_night(register_plugin):
+    register_plugin("src.constraints.c06_forbid_remote_after_night")
 
     c = _get_constraint()
 
@@ -81,17 +90,19 @@ def test_blocks_remote_am_after_night():
     ctx = {"days": [d1, d2], "hospitals": [h_local, h_remote]}
 
     c.apply(m, x, ctx)
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
-    assert pulp.LpStatus[status] == "Optimal"
 
-    v_n = pulp.value(x[(h_local.name, w, d1, ShiftType.NIGHT)])
-    v_a = pulp.value(x[(h_remote.name, w, d2, ShiftType.AM)])
-    assert v_n + v_a <= 1  # 同時不可
+    # 同時不可: x_night + x_remote_am <= 1 の行が張られる
+    assert _has_constraint(
+        m,
+        [x[(h_local.name, w, d1, ShiftType.NIGHT)], x[(h_remote.name, w, d2, ShiftType.AM)]],
+        pulp.LpConstraintLE,
+        1,
+    )
 
 
-def test_allows_remote_pm_or_night_after_night():
+def test_allows_remote_pm_or_night_after_night(register_plugin):
     """翌日が Remote x PM or Remote x NIGHT は禁止対象外 → 同時許容。"""
-    import src.constraints.c06_forbid_remote_after_night  # noqa: F401
+    register_plugin("src.constraints.c06_forbid_remote_after_night")
 
     c = _get_constraint()
 
@@ -113,18 +124,14 @@ def test_allows_remote_pm_or_night_after_night():
     ctx = {"days": [d1, d2], "hospitals": [h_local, h_remote]}
 
     c.apply(m, x, ctx)
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
-    assert pulp.LpStatus[status] == "Optimal"
 
-    # PM と NIGHT は禁止対象外 → night翌日の同時も可
-    assert pulp.value(x[(h_local.name, w, d1, ShiftType.NIGHT)]) == 1
-    assert pulp.value(x[(h_remote.name, w, d2, ShiftType.PM)]) == 1
-    assert pulp.value(x[(h_remote.name, w, d2, ShiftType.NIGHT)]) == 1
+    # PM と NIGHT は禁止対象外 → 制約行は張られず、night翌日の同時も可
+    assert len(m.constraints) == 0
 
 
-def test_multiple_remote_hospitals_sum_blocked():
+def test_multiple_remote_hospitals_sum_blocked(register_plugin):
     """翌日が複数のリモート病院(DAY/AM)のときも合計で締める。"""
-    import src.constraints.c06_forbid_remote_after_night  # noqa: F401
+    register_plugin("src.constraints.c06_forbid_remote_after_night")
 
     c = _get_constraint()
 
@@ -147,11 +154,44 @@ def test_multiple_remote_hospitals_sum_blocked():
     ctx = {"days": [d1, d2], "hospitals": [h_local, h_remote1, h_remote2]}
 
     c.apply(m, x, ctx)
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
-    assert pulp.LpStatus[status] == "Optimal"
-
-    vN = pulp.value(x[(h_local.name, w, d1, ShiftType.NIGHT)])
-    v1 = pulp.value(x[(h_remote1.name, w, d2, ShiftType.DAY)])
-    v2 = pulp.value(x[(h_remote2.name, w, d2, ShiftType.AM)])
-    # 翌日の Remote(DAY/AM) は“合計”で締められる
-    assert vN + v1 + v2 <= 2  # night + (remote day or am) の同時は不可
+
+    # 翌日の Remote(DAY/AM) は“合計”で締められる: xN + xR1 + xR2 <= 1
+    assert _has_constraint(m, list(x.values()), pulp.LpConstraintLE, 1)
+
+
+def test_nights_on_same_day_are_not_bundled_without_c02(register_plugin):
+    """
+    c06 単体では、同じ日の当直が複数あっても互いを締めない(同日の当直数は c02 の担当)。
+    当直ごとに「当直 + 翌日のリモート DAY/AM <= 1」の行が張られる。
+    """
+    register_plugin("src.constraints.c06_forbid_remote_after_night")
+    assert [c.name for c in all_constraints()] == ["forbid_remote_after_night"]
+
+    c = _get_constraint()
+
+    h_a = Hospital(name="LocalA", is_remote=False, is_university=False, demand_rules=[])
+    h_b = Hospital(name="LocalB", is_remote=False, is_university=False, demand_rules=[])
+    h_remote = Hospital(name="Remote", is_remote=True, is_university=False, demand_rules=[])
+
+    w = "診断05"
+    d1 = dt.date(2025, 10, 15)
+    d2 = dt.date(2025, 10, 16)
+
+    x_na = pulp.LpVariable("xNA", 0, 1, cat="Binary")
+    x_nb = pulp.LpVariable("xNB", 0, 1, cat="Binary")
+    x_r = pulp.LpVariable("xR", 0, 1, cat="Binary")
+    x = {
+        (h_a.name, w, d1, ShiftType.NIGHT): x_na,
+        (h_b.name, w, d1, ShiftType.NIGHT): x_nb,
+        (h_remote.name, w, d2, ShiftType.DAY): x_r,
+    }
+
+    m = pulp.LpProblem("c06_alone", pulp.LpMaximize)
+    m += pulp.lpSum(x.values())
+    ctx = {"days": [d1, d2], "hospitals": [h_a, h_b, h_remote]}
+
+    c.apply(m, x, ctx)
+
+    assert len(m.constraints) == 2
+    assert _has_constraint(m, [x_na, x_r], pulp.LpConstraintLE, 1)
+    assert _has_constraint(m, [x_nb, x_r], pulp.LpConstraintLE, 1)
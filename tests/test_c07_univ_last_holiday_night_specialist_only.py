@@ -6,7 +6,7 @@ import pulp
 from src.domain.types import Hospital, ShiftType, Worker
 
 
-def test_university_last_holiday_night_forbids_non_specialist(ensure_constraint):
+def test_university_last_holiday_night_forbids_non_specialist(ensure_constraint, lp_solver):
     c = ensure_constraint(
         "src.constraints.c07_univ_last_holiday_night_specialist",
         "univ_last_holiday_night_specialist_only",
@@ -34,7 +34,7 @@ def test_university_last_holiday_night_forbids_non_specialist(ensure_constraint)
     ctx = {"days": [d_sat, d_sun, d_mon], "hospitals": [univ, local], "workers": [sp, gen]}
 
     c.apply(m, x, ctx)
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     assert pulp.value(x[(univ.name, gen.name, d_sun, ShiftType.NIGHT)]) == 0
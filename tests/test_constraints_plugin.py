@@ -59,7 +59,7 @@ def test_autoimport_loads_plugins_and_registers():
     assert "one_person_per_hospital" in names
 
 
-def test_one_person_per_hospital_constraint_applies_and_solves():
+def test_one_person_per_hospital_constraint_applies_and_solves(lp_solver):
     """
     x[(h,w,d,s)] を2変数(同一 (h,d)、異なる worker/shift)だけ作り、
     制約適用後は Σ_{w,s} x[h,w,d,s] == 1 が張られて解けることを確認。
@@ -87,21 +87,22 @@ def test_one_person_per_hospital_constraint_applies_and_solves():
         c.apply(model, x, ctx)
 
     # 求解して、ちょうど1個が選ばれることを確認
-    status = model.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = model.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     chosen = [k for k, v in x.items() if pulp.value(v) == 1]
     assert len(chosen) == 1  # どちらか片方のみ選ばれる
 
 
-def test_constraint_name_is_printable_after_autoimport(capsys):
+def test_constraint_name_is_printable_after_autoimport(capsys, frozen_registry):
     """
-    main でやるのと同様に、auto_import_all → all_constraints で name を print できることを確認。
+    main でやるのと同様に、全プラグイン読込 → all_constraints で name を print できることを確認。
+    (パッケージの走査は auto_import_all 自体のテストに任せ、ここではスナップショットを再登録する)
     """
-    from src.constraints.autoimport import auto_import_all
+    import src.constraints.base as base
     from src.constraints.base import all_constraints
 
-    auto_import_all()
+    base.constraint_registry.update(frozen_registry)
 
     for c in all_constraints():
         print(c.name)
@@ -109,3 +110,29 @@ def test_constraint_name_is_printable_after_autoimport(capsys):
     out = capsys.readouterr().out
     # プラグイン名が出力に含まれる
     assert "one_person_per_hospital" in out
+
+
+def test_autoimport_scans_package_only_once(monkeypatch):
+    import src.constraints.autoimport as autoimport
+
+    autoimport.auto_import_all()
+
+    # 2 回目以降はディレクトリ走査を行わない
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("iter_modules should not be called again")
+
+    monkeypatch.setattr(autoimport.pkgutil, "iter_modules", _fail)
+    autoimport.auto_import_all()
+
+
+def test_reimporting_plugin_does_not_register_twice():
+    from src.constraints.base import all_constraints
+
+    mod = "src.constraints.c01_one_person_per_hospital"
+    importlib.import_module(mod)
+    # モジュールを再 import しても同名の制約は 1 つだけ
+    sys.modules.pop(mod, None)
+    importlib.import_module(mod)
+
+    names = [c.name for c in all_constraints()]
+    assert names.count("one_person_per_hospital") == 1
@@ -2,133 +2,189 @@
 from __future__ import annotations
 
 import datetime as dt
+import io
 from pathlib import Path
 
+import pytest
 from openpyxl import load_workbook
 
 from src.domain.types import ShiftType
 from src.io.export_excel import export_schedule_to_excel
 
 
-def _rgb(cell):
-    """openpyxl の色は '00FFF4CC' のように先頭にアルファが付くことがあるので末尾6桁で比較"""
-    fill = cell.fill
-    if not fill or fill.fill_type != "solid":
-        return None
-    c = fill.start_color
-    rgb = getattr(c, "rgb", None)
-    if not rgb:
-        return None
-    return rgb[-6:].upper()  # e.g., 'FFF4CC'
-
-
-def test_export_excel_basic_grid_and_styles(tmp_path: Path):
-    # ==== 準備 ====
-    # 2025-10-03 (金), 2025-10-04 (土), 2025-10-05 (日)
-    d1 = dt.date(2025, 10, 3)
-    d2 = dt.date(2025, 10, 4)  # 土曜 → 休日塗りつぶし期待
-    d3 = dt.date(2025, 10, 5)  # 日曜 → 休日塗りつぶし期待
-    days = [d1, d2, d3]
-
-    hospitals = ["大学", "病院A"]
-    # (h, w, d, s) -> 1/0
-    assignment = {
-        (hospitals[0], "診断01", d1, ShiftType.DAY): 1,  # サフィックス無し
-        (hospitals[0], "診断02", d1, ShiftType.AM): 1,  # " AM"
-        (hospitals[1], "診断03", d1, ShiftType.PM): 1,  # " PM"
-        (hospitals[1], "診断04", d2, ShiftType.NIGHT): 1,  # サフィックス無し(当直)
-        # 同一セルに複数(AM/PM)を入れて連結動作確認
-        (hospitals[0], "診断05", d3, ShiftType.AM): 1,
-        (hospitals[0], "診断06", d3, ShiftType.PM): 1,
+def _collect_fills(ws) -> dict[tuple[int, int], str | None]:
+    """シートを1回走査して {(row, col): rgb} を作る。
+
+    openpyxl の色は '00FFF4CC' のように先頭にアルファが付くことがあるので末尾6桁で比較。
+    ベタ塗りでないセルは None。
+    """
+    return {
+        (c.row, c.column): (
+            c.fill.start_color.rgb[-6:].upper()
+            if c.fill and c.fill.fill_type == "solid" and c.fill.start_color.rgb
+            else None
+        )
+        for row in ws.iter_rows()
+        for c in row
     }
 
-    out = tmp_path / "schedule.xlsx"
 
-    # ==== 実行 ====
+# 2025-10-03 (金), 2025-10-04 (土), 2025-10-05 (日)
+D1 = dt.date(2025, 10, 3)
+D2 = dt.date(2025, 10, 4)  # 土曜 → 休日塗りつぶし期待
+D3 = dt.date(2025, 10, 5)  # 日曜 → 休日塗りつぶし期待
+HOSPITALS = ["大学", "病院A"]
+
+
+def _read_values(path) -> dict[tuple[int, int], object]:
+    """スタイルを読まずに値だけを {(row, col): value} で返す(read_only のストリーミング読込)"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {
+            (r, c): v
+            for r, row in enumerate(wb.active.iter_rows(values_only=True), start=1)
+            for c, v in enumerate(row, start=1)
+        }
+    finally:
+        wb.close()
+
+
+# (h, w, d, s) -> 1/0
+ASSIGNMENT = {
+    (HOSPITALS[0], "診断01", D1, ShiftType.DAY): 1,  # サフィックス無し
+    (HOSPITALS[0], "診断02", D1, ShiftType.AM): 1,  # " AM"
+    (HOSPITALS[1], "診断03", D1, ShiftType.PM): 1,  # " PM"
+    (HOSPITALS[1], "診断04", D2, ShiftType.NIGHT): 1,  # サフィックス無し(当直)
+    # 同一セルに複数(AM/PM)を入れて連結動作確認
+    (HOSPITALS[0], "診断05", D3, ShiftType.AM): 1,
+    (HOSPITALS[0], "診断06", D3, ShiftType.PM): 1,
+}
+
+
+def _export_to_bytes(**kwargs) -> bytes:
+    """ディスクを介さずメモリ上に書き出す"""
+    buf = io.BytesIO()
+    export_schedule_to_excel(out_path=buf, **kwargs)
+    return buf.getvalue()
+
+
+@pytest.fixture(scope="module")
+def exported_bytes() -> bytes:
+    """代表的な割当をモジュール内で一度だけ書き出す"""
+    return _export_to_bytes(assignment=ASSIGNMENT, days=[D1, D2, D3], hospital_names=HOSPITALS)
+
+
+@pytest.fixture(scope="module")
+def exported(exported_bytes):
+    """塗りつぶしとフリーズペインの検査用に、スタイル込みで一度だけ読み込んで (ws, fills) を返す"""
+    ws = load_workbook(io.BytesIO(exported_bytes)).active
+    return ws, _collect_fills(ws)
+
+
+@pytest.fixture(scope="module")
+def exported_values(exported_bytes):
+    """値だけを検査するテスト用(スタイルは読まない)"""
+    return _read_values(io.BytesIO(exported_bytes))
+
+
+def test_export_excel_writes_to_file_path(tmp_path: Path, exported_bytes):
+    """パス指定でもディスクに同じブックが書き出される(ファイルを触るのはこのテストだけ)"""
+    out = tmp_path / "schedule.xlsx"
     export_schedule_to_excel(
-        assignment=assignment,
-        days=days,
-        hospital_names=hospitals,
+        assignment=ASSIGNMENT,
+        days=[D1, D2, D3],
+        hospital_names=HOSPITALS,
         out_path=str(out),
     )
-
     assert out.exists(), "Excelファイルが作成されていません"
+    assert _read_values(out) == _read_values(io.BytesIO(exported_bytes))
 
-    # ==== 検証 ====
-    wb = load_workbook(out)
-    ws = wb.active
 
-    # シート名
-    assert ws.title == "勤務表"
+def _parts(value) -> set[str]:
+    """セル内の "a, b" 形式を順不同で比較できるよう集合にする"""
+    return {p.strip() for p in (value or "").split(",") if p.strip()}
 
-    # 見出し
-    assert ws["A1"].value == "日付"
-    assert ws["B1"].value == "曜日"
-    assert ws["C1"].value == hospitals[0]
-    assert ws["D1"].value == hospitals[1]
 
-    # フリーズペイン
+def test_export_excel_sheet_title_and_freeze_panes(exported):
+    ws, _ = exported
+    assert ws.title == "勤務表"
     assert ws.freeze_panes == "C2"
 
-    # 1行目以外のグリッド:A列=日付 / B列=曜 / C..=病院
-    # 行のオフセットは2行目から days[0]
-    # d1: 2025-10-03(金)
-    r1 = 2
-    assert ws.cell(r1, 1).value == d1.isoformat()
-    assert ws.cell(r1, 2).value in ("金曜", "金")  # 実装は "金曜"、将来の表記変更に少し寛容に
-    # 病院セル
-    # 大学: 診断01 + 診断02 AM → "診断01 / 診断02 AM" の順とは限らないので集合比較
-    c_univ_d1 = ws.cell(r1, 3).value or ""
-    parts = {p.strip() for p in c_univ_d1.split(",") if p.strip()}
-    assert {"診断01", "診断02AM"} == parts
 
+def test_export_excel_headers(exported_values):
+    cells = exported_values
+    assert cells[1, 1] == "日付"
+    assert cells[1, 2] == "曜日"
+    assert cells[1, 3] == HOSPITALS[0]
+    assert cells[1, 4] == HOSPITALS[1]
+
+
+def test_export_excel_weekday_row(exported_values):
+    # 1行目以外のグリッド:A列=日付 / B列=曜 / C..=病院(2行目から days[0])
+    cells = exported_values
+    r1 = 2
+    assert cells[r1, 1] == D1.isoformat()
+    assert cells[r1, 2] in ("金曜", "金")  # 実装は "金曜"、将来の表記変更に少し寛容に
+    # 大学: 診断01 + 診断02 AM → 順序は問わないので集合比較
+    assert _parts(cells[r1, 3]) == {"診断01", "診断02AM"}
     # 病院A: 診断03 PM
-    assert (ws.cell(r1, 4).value or "").strip() == "診断03PM"
+    assert (cells[r1, 4] or "").strip() == "診断03PM"
+
 
-    # d2: 土曜行が薄いオレンジか
-    r2 = 3
-    assert ws.cell(r2, 1).value == d2.isoformat()
-    # 行全体が塗られていること(代表としてA列を検査)
-    assert _rgb(ws.cell(r2, 1)) == "FFF4CC"
+def test_export_excel_weekend_rows_are_filled(exported, exported_values):
+    _, fills = exported
+    # 平日行は塗らない
+    assert fills[2, 1] is None
+    # 行全体が薄いオレンジで塗られていること(代表としてA列を検査)
+    for r, d in ((3, D2), (4, D3)):
+        assert exported_values[r, 1] == d.isoformat()
+        assert fills[r, 1] == "FFF4CC"
 
-    # 夜勤はサフィックス無し
-    assert (ws.cell(r2, 4).value or "").strip() == "診断04"
 
-    # d3: 日曜行が薄いオレンジ
-    r3 = 4
-    assert ws.cell(r3, 1).value == d3.isoformat()
-    assert _rgb(ws.cell(r3, 1)) == "FFF4CC"
+def test_export_excel_night_has_no_suffix(exported_values):
+    assert (exported_values[3, 4] or "").strip() == "診断04"
 
+
+def test_export_excel_joins_multiple_workers_in_cell(exported_values):
     # 同一セルの連結(AM/PM)
-    c_univ_d3 = (ws.cell(r3, 3).value or "").strip()
-    parts3 = {p.strip() for p in c_univ_d3.split(",") if p.strip()}
-    assert {"診断05AM", "診断06PM"} == parts3
+    assert _parts(exported_values[4, 3]) == {"診断05AM", "診断06PM"}
 
 
-def test_empty_cells_are_blank(tmp_path: Path):
+def test_empty_cells_are_blank():
     """割当が無いセルは空文字 or None が入っている(エクスポートで例外が出ない)"""
     d = dt.date(2025, 10, 1)
     days = [d]
     hospitals = ["A病院", "B病院"]
     assignment = {}  # 何も割当無し
 
-    out = tmp_path / "empty.xlsx"
-    export_schedule_to_excel(
-        assignment=assignment,
-        days=days,
-        hospital_names=hospitals,
-        out_path=str(out),
-    )
-    wb = load_workbook(out)
-    ws = wb.active
+    data = _export_to_bytes(assignment=assignment, days=days, hospital_names=hospitals)
+    # 値しか見ないのでスタイルは読まない
+    cells = _read_values(io.BytesIO(data))
 
-    assert ws["A1"].value == "日付"
-    assert ws["B1"].value == "曜日"
-    assert ws["C1"].value == hospitals[0]
-    assert ws["D1"].value == hospitals[1]
+    assert cells[1, 1] == "日付"
+    assert cells[1, 2] == "曜日"
+    assert cells[1, 3] == hospitals[0]
+    assert cells[1, 4] == hospitals[1]
 
     # データ行は空
     r = 2
-    assert ws.cell(r, 1).value == d.isoformat()
-    assert (ws.cell(r, 3).value or "") == ""
-    assert (ws.cell(r, 4).value or "") == ""
+    assert cells[r, 1] == d.isoformat()
+    assert (cells[r, 3] or "") == ""
+    assert (cells[r, 4] or "") == ""
+
+
+def test_shortage_cells_are_filled_except_on_holidays():
+    """人手不足セルは赤系で塗る(土日祝の行は休日色が優先)"""
+    d1 = dt.date(2025, 10, 3)  # 金曜
+    d2 = dt.date(2025, 10, 4)  # 土曜
+    hospitals = ["A病院", "B病院"]
+    shortage = {("B病院", d1): 1.0, ("B病院", d2): 1.0, ("対象外", d1): 1.0}
+
+    data = _export_to_bytes(
+        assignment={}, shortage_slack=shortage, days=[d1, d2], hospital_names=hospitals
+    )
+    fills = _collect_fills(load_workbook(io.BytesIO(data)).active)
+
+    assert fills[2, 4] == "FF9999"
+    assert fills[2, 3] is None
+    assert fills[3, 4] == "FFF4CC"
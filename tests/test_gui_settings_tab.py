@@ -0,0 +1,58 @@
+"""設定編集タブ(SettingsTab)のテスト"""
+
+import sys
+
+import pytest
+
+try:
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+
+    import src.gui.app as gui_app
+
+    QT_AVAILABLE = True
+except Exception:
+    QT_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+
+
+@pytest.fixture
+def tab(monkeypatch):
+    monkeypatch.setattr(gui_app, "_info", lambda *a: None)
+    monkeypatch.setattr(gui_app, "_err", lambda parent, msg: pytest.fail(msg))
+    return gui_app.SettingsTab()
+
+
+def test_save_skips_revalidation_of_unchanged_toml(tab, tmp_path, monkeypatch):
+    p = tmp_path / "dates.toml"
+    p.write_text('[A]\ndates = ["2025-10-03"]\n', encoding="utf-8")
+    tab.load_config_from_path(p)
+
+    import tomllib
+
+    calls = []
+    loads = tomllib.loads
+    monkeypatch.setattr(tomllib, "loads", lambda txt: calls.append(txt) or loads(txt))
+
+    tab.save_config()
+    tab.save_config()
+    assert calls == []
+
+    # 内容が変われば再検証する
+    tab.editor.setPlainText('[B]\ndates = ["2025-10-04"]\n')
+    tab.save_config()
+    assert len(calls) == 1
+    assert p.read_text(encoding="utf-8").startswith("[B]")
+
+
+def test_backup_copies_bytes_verbatim(tmp_path):
+    p = tmp_path / "max.csv"
+    raw = "\ufeffName,A\r\n診断01,1\r\n".encode()
+    p.write_bytes(raw)
+
+    gui_app.backup(p)
+    assert (tmp_path / "max.csv.bak").read_bytes() == raw
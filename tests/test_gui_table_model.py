@@ -0,0 +1,149 @@
+"""GUI のテーブルモデル(DataFrameModel / LogModel)のテスト"""
+
+import sys
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+try:
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QColor
+    from PySide6.QtWidgets import QApplication, QTableView
+
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+
+    from src.gui.app import (
+        DataFrameModel,
+        LogModel,
+        MainTab,
+        coerce_int_columns,
+        df_to_table,
+        read_max_assignments_df,
+        table_to_df,
+    )
+
+    QT_AVAILABLE = True
+except Exception:
+    QT_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not QT_AVAILABLE, reason="Qt not available")
+
+
+def _display(model, r, c):
+    return model.data(model.index(r, c), Qt.ItemDataRole.DisplayRole)
+
+
+def test_dataframe_model_displays_ints_and_blanks():
+    df = coerce_int_columns(pd.DataFrame({"Name": ["a", "b"], "H1": [1.0, None], "H2": [0.5, 2.0]}))
+    model = DataFrameModel(df)
+
+    assert (model.rowCount(), model.columnCount()) == (2, 3)
+    assert model.headerData(1, Qt.Orientation.Horizontal) == "H1"
+    assert _display(model, 0, 0) == "a"
+    assert _display(model, 0, 1) == 1
+    assert _display(model, 1, 1) == ""
+    # 整数列でなくても整数相当の値は int で表示する
+    assert _display(model, 0, 2) == "0.5"
+    assert _display(model, 1, 2) == 2
+
+
+def test_dataframe_model_set_data_updates_frame():
+    df = coerce_int_columns(pd.DataFrame({"Name": ["a"], "H1": [1]}))
+    model = DataFrameModel(df)
+
+    assert model.setData(model.index(0, 1), 3)
+    assert model.dataframe().iat[0, 1] == 3
+    # 空文字は NA として保持
+    assert model.setData(model.index(0, 1), "")
+    assert pd.isna(model.dataframe().iat[0, 1])
+    # 整数列に文字列が入っても落ちずに保持する
+    assert model.setData(model.index(0, 1), "x")
+    assert _display(model, 0, 1) == "x"
+
+
+def test_df_to_table_round_trip():
+    table = QTableView()
+    df = pd.DataFrame({"Name": ["a"], "H1": [1]})
+    df_to_table(table, df)
+
+    assert table_to_df(table).equals(df)
+
+
+def test_log_model_append_rows_with_color():
+    model = LogModel()
+    model.append("12:00:00", "通常")
+    model.append("12:00:01", "不足", QColor("#DC143C"))
+
+    assert model.rowCount() == 2
+    assert model.headerData(0, Qt.Orientation.Horizontal) == "時刻"
+    assert _display(model, 1, 1) == "不足"
+    assert model.data(model.index(0, 1), Qt.ItemDataRole.ForegroundRole) is None
+    assert model.data(model.index(1, 1), Qt.ItemDataRole.ForegroundRole) == QColor("#DC143C")
+
+
+def test_coerce_int_columns_only_integral_columns():
+    df = pd.DataFrame(
+        {"Name": ["a", "b"], "x": [1.0, None], "z": [1.5, 2.0], "f": [float("inf"), 1.0]}
+    )
+    out = coerce_int_columns(df)
+
+    assert list(out.columns) == list(df.columns)
+    assert str(out["x"].dtype) == "Int64"
+    assert out["z"].dtype == "float64"
+    assert out["f"].dtype == "float64"
+    assert out["Name"].tolist() == ["a", "b"]
+    # 元の DataFrame は変更しない
+    assert df["x"].dtype == "float64"
+
+
+def test_read_max_assignments_df_typed(tmp_path):
+    p = tmp_path / "max.csv"
+    p.write_text("Name,大学,病院A\n診断01,,\n診断02,2,1\n", encoding="utf-8")
+    df = read_max_assignments_df(p)
+
+    assert df is not None
+    assert [str(t) for t in df.dtypes] == ["string", "Int64", "Int64"]
+    assert pd.isna(df.iat[0, 1])
+    assert df.iat[1, 1] == 2
+
+
+def test_read_max_assignments_df_falls_back_on_non_int(tmp_path):
+    p = tmp_path / "max.csv"
+    p.write_text("Name,大学\n診断01,abc\n", encoding="utf-8")
+    assert read_max_assignments_df(p) is None
+
+
+def test_log_model_extend_inserts_rows_at_once():
+    model = LogModel()
+    inserted = []
+    model.rowsInserted.connect(lambda _parent, first, last: inserted.append((first, last)))
+    model.append("12:00:00", "a")
+    model.extend([("12:00:01", "b", None), ("12:00:02", "c", None)])
+    model.extend([])
+
+    assert model.rowCount() == 3
+    assert inserted == [(0, 0), (1, 2)]
+
+
+def test_main_tab_log_append_batches_rows(monkeypatch):
+    # 時計を止めて、実行環境の速さに関係なく「直後のログ」になるようにする
+    import src.gui.app as gui_app
+
+    monkeypatch.setattr(gui_app, "time", SimpleNamespace(monotonic=lambda: 100.0))
+
+    tab = MainTab()
+    tab.log_append("first")
+    # 直後のログはすぐには反映されず、まとめて反映される
+    tab.log_append("second", "#DC143C")
+    tab.log_append("third")
+    assert tab.log_model.rowCount() == 1
+
+    tab._flush_logs()
+    assert tab.log_model.rowCount() == 3
+    assert _display(tab.log_model, 2, 1) == "third"
+    assert tab.log_model.data(
+        tab.log_model.index(1, 1), Qt.ItemDataRole.ForegroundRole
+    ) == QColor("#DC143C")
@@ -6,10 +6,12 @@ import pytest
 
 from src.calendar.utils import (
     generate_monthly_dates,
+    holidays_in,
     is_holiday_or_weekend,
     is_last_holiday,
     is_public_holiday,
     is_weekday,
+    last_holidays_in,
 )
 from src.domain.types import Weekday
 
@@ -197,6 +199,15 @@ def test_is_last_holiday_singleton_is_false():
     assert is_last_holiday(d) is False
 
 
+def test_holidays_in_and_last_holidays_in_match_per_day_checks():
+    """月単位の集合が日ごとの判定結果と一致する"""
+    days = generate_monthly_dates(2025, 11)
+    assert holidays_in(days) == {d for d in days if is_holiday_or_weekend(d)}
+    assert last_holidays_in(days) == {d for d in days if is_last_holiday(d)}
+    # 2025/11/22(土)〜24(月・振替休日)の連休最終日
+    assert dt.date(2025, 11, 24) in last_holidays_in(days)
+
+
 def test_is_year_end_holiday():
     """
     年末の12月29日~31日が祝日であることを確認。
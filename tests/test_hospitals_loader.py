@@ -43,6 +43,7 @@ def test_load_basic_single_hospital_weekly(tmp_path, capsys):
     assert isinstance(r, HospitalDemandRule)
     assert r.shift_type == ShiftType.DAY
     assert r.weekdays == [Weekday.MONDAY, Weekday.WEDNESDAY, Weekday.FRIDAY]
+    assert r.weekday_set == frozenset(r.weekdays)
     assert r.frequency == Frequency.WEEKLY
 
     # assert "Loaded config for hospital: A病院" in out
@@ -1,5 +1,3 @@
-import importlib
-import sys
 
 import pulp
 import pytest
@@ -12,8 +10,6 @@ def _reset_registry_and_module():
     import src.constraints.base as base
 
     base.constraint_registry.clear()
-    sys.modules.pop("src.constraints.c01_one_person_per_hospital", None)
-    importlib.invalidate_caches()
 
 
 @pytest.fixture(autouse=True)
@@ -23,9 +19,9 @@ def _clean():
     _reset_registry_and_module()
 
 
-def test_get_constraint_summary():
+def test_get_constraint_summary(register_plugin):
     """制約のsummaryが正しく取得できることをテスト"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
 
     # summary取得をテスト
     summary = _get_constraint_summary("one_person_per_hospital")
@@ -36,9 +32,9 @@ def test_get_constraint_summary():
     assert unknown_summary == "unknown_constraint"
 
 
-def test_iter_penalty_rows_with_summary():
+def test_iter_penalty_rows_with_summary(register_plugin):
     """ペナルティ行のイテレーションでsummaryが含まれることをテスト"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
 
     # テスト用のペナルティ変数
     penalty_var = pulp.LpVariable("test_penalty", 0, 1, cat="Continuous")
@@ -0,0 +1,33 @@
+import pulp
+
+from src.constraints.penalty_utils import add_penalties, iter_scaled_penalties
+
+
+def test_add_penalties_accepts_generator():
+    z1 = pulp.LpVariable("z1", 0, 1, cat="Binary")
+    z2 = pulp.LpVariable("z2", 0, 1, cat="Binary")
+    ctx = {}
+
+    add_penalties(ctx, "src_a", ((z, 2.0, {"i": i}) for i, z in enumerate([z1, z2])))
+
+    assert [(p.var, p.weight, p.meta, p.source) for p in ctx["penalties"]] == [
+        (z1, 2.0, {"i": 0}, "src_a"),
+        (z2, 2.0, {"i": 1}, "src_a"),
+    ]
+
+
+def test_add_penalties_with_no_items_leaves_ctx_untouched():
+    ctx = {}
+    add_penalties(ctx, "src_a", iter(()))
+    assert "penalties" not in ctx
+
+
+def test_iter_scaled_penalties_applies_source_scale():
+    z1 = pulp.LpVariable("z1", 0, 1, cat="Binary")
+    z2 = pulp.LpVariable("z2", 0, 1, cat="Binary")
+    ctx = {"penalty_source_scale": {"src_a": 3}}
+    add_penalties(ctx, "src_a", [(z1, 2.0, {})])
+    add_penalties(ctx, "src_b", [(z2, 5, {})])
+
+    scaled = [(item.var, w) for item, w in iter_scaled_penalties(ctx)]
+    assert scaled == [(z1, 6.0), (z2, 5.0)]
@@ -18,7 +18,7 @@ def _s03_penalty_value(ctx) -> float:
     return pen
 
 
-def test_two_weekdays_balance_no_penalty(ensure_constraint):
+def test_two_weekdays_balance_no_penalty(ensure_constraint, lp_solver):
     """
     平日2日・候補2人 → 平均=1、各1回ずつでペナルティ0になること。
     """
@@ -44,10 +44,12 @@ def test_two_weekdays_balance_no_penalty(ensure_constraint):
     ctx = {"hospitals": [h], "penalties": []}
 
     c.apply(m, x, ctx)
+    # 各人の候補は2日(=U)なので over は取り得ず、under だけが作られる
+    assert {meta["kind"] for _var, _w, meta, _src in ctx["penalties"]} == {"under"}
     base_obj = pulp.lpSum(x.values())
     set_objective_with_penalties(m, base_obj, ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert _s03_penalty_value(ctx) <= 1e-8
     assert math.isclose(
@@ -57,7 +59,7 @@ def test_two_weekdays_balance_no_penalty(ensure_constraint):
     )
 
 
-def test_weekend_weighting_targets_two_each_no_penalty(ensure_constraint):
+def test_weekend_weighting_targets_two_each_no_penalty(ensure_constraint, lp_solver):
     """
     Fri(1.0)+Sat(1.5)+Sun(1.5)+Mon(1.0)=5.0 → 平均2.5。2~3収まればペナルティ0。
     """
@@ -92,12 +94,12 @@ def test_weekend_weighting_targets_two_each_no_penalty(ensure_constraint):
     c.apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert _s03_penalty_value(ctx) <= 1e-8
 
 
-def test_forced_skew_incurs_penalty_with_6_days(ensure_constraint):
+def test_forced_skew_incurs_penalty_with_6_days(ensure_constraint, lp_solver):
     c = ensure_constraint("src.constraints.s03_night_deviation_band", "soft_night_deviation_band")
 
     h = Hospital(name="大学", is_remote=False, is_university=True, demand_rules=[])
@@ -126,7 +128,7 @@ def test_forced_skew_incurs_penalty_with_6_days(ensure_constraint):
     c.apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     print(f"[Debug] Total penalty: {_s03_penalty_value(ctx)}")
 
@@ -22,7 +22,7 @@ def _sum_penalties(ctx, source="soft_non_night_balance_by_weekday") -> float:
     return total
 
 
-def test_balance_two_mondays_day_no_penalty(ensure_constraint):
+def test_balance_two_mondays_day_no_penalty(ensure_constraint, lp_solver):
     """
     同一病院 x 月曜 x DAY が2回、候補2人 → 平均A=1、L=U=1。
     1-1 に割れれば over/under は立たない → ペナルティ0。
@@ -55,14 +55,14 @@ def test_balance_two_mondays_day_no_penalty(ensure_constraint):
     # ベースは割当最大化(= 2)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     # 典型解は W1@d1, W2@d2 など → 1-1 でペナルティ0
     assert _sum_penalties(ctx) <= 1e-8
 
 
-def test_skew_two_mondays_day_has_penalty(ensure_constraint):
+def test_skew_two_mondays_day_has_penalty(ensure_constraint, lp_solver):
     """
     同一病院 x 月曜 x DAY が2回、候補2人 → A=1, L=U=1。
     W1 を2回とも固定すると 2-0 → over(W1)>=1, under(W2)>=1 → ペナルティ>0。
@@ -96,13 +96,13 @@ def test_skew_two_mondays_day_has_penalty(ensure_constraint):
     c.apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     assert _sum_penalties(ctx) > 1e-6
 
 
-def test_min_candidate_filter_excludes_sparse_worker(ensure_constraint):
+def test_min_candidate_filter_excludes_sparse_worker(ensure_constraint, lp_solver):
     """
     min_candidate=2 のデフォルト動作確認。
     (h,Mon,DAY) バケツで W1 の候補は2回, W2の候補は1回のみ→ W2は Wh から除外。
@@ -137,7 +137,7 @@ def test_min_candidate_filter_excludes_sparse_worker(ensure_constraint):
     c.apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
 
     # W2 は min_candidate(=2) を満たさないため Wh から外れ、Kh<=1 でスキップ → ペナルティ0
@@ -27,7 +27,7 @@ def _bin(name: str, lb=0, ub=1):
     return pulp.LpVariable(name, lowBound=lb, upBound=ub, cat="Binary")
 
 
-def test_penalty_for_DAY_after_NIGHT():
+def test_penalty_for_DAY_after_NIGHT(lp_solver):
     # 前日 NIGHT, 翌日 DAY -> ペナルティ = weight
     d1 = dt.date(2025, 1, 10)
     d2 = dt.date(2025, 1, 11)
@@ -44,12 +44,12 @@ def test_penalty_for_DAY_after_NIGHT():
     SoftNoDutyAfterNight(weight=0.5).apply(m, x, ctx)
     set_objective_with_penalties(m, base_obj, ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert abs(_sum_penalties(ctx) - 0.5) <= 1e-8
 
 
-def test_penalty_for_AM_after_NIGHT():
+def test_penalty_for_AM_after_NIGHT(lp_solver):
     # 前日 NIGHT, 翌日 AM -> ペナルティ = weight
     d1 = dt.date(2025, 2, 1)
     d2 = dt.date(2025, 2, 2)
@@ -66,12 +66,12 @@ def test_penalty_for_AM_after_NIGHT():
     SoftNoDutyAfterNight(weight=0.8).apply(m, x, ctx)
     set_objective_with_penalties(m, base_obj, ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert abs(_sum_penalties(ctx) - 0.8) <= 1e-8
 
 
-def test_no_penalty_for_PM_or_no_night():
+def test_no_penalty_for_PM_or_no_night(lp_solver):
     # PM は対象外, また前日に NIGHT が無い場合も対象外
     # NIGHT -> PM -> 0
     # no NIGHT -> DAY -> 0
@@ -87,7 +87,7 @@ def test_no_penalty_for_PM_or_no_night():
     ctx1 = {"days": days}
     SoftNoDutyAfterNight(weight=1.0).apply(m1, x1, ctx1)
     set_objective_with_penalties(m1, pulp.lpSum(x1.values()), ctx1)
-    status = m1.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m1.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert _sum_penalties(ctx1) <= 1e-8
 
@@ -98,12 +98,12 @@ def test_no_penalty_for_PM_or_no_night():
     ctx2 = {"days": days}
     SoftNoDutyAfterNight(weight=1.0).apply(m2, x2, ctx2)
     set_objective_with_penalties(m2, pulp.lpSum(x2.values()), ctx2)
-    status = m2.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m2.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert _sum_penalties(ctx2) <= 1e-8
 
 
-def test_no_penalty_when_next_day_outside_horizon():
+def test_no_penalty_when_next_day_outside_horizon(lp_solver):
     # days = [d1] のみ -> 翌日が計画範囲外なので 0
     d1 = dt.date(2025, 4, 30)
     days = [d1]
@@ -116,12 +116,12 @@ def test_no_penalty_when_next_day_outside_horizon():
     SoftNoDutyAfterNight(weight=1.0).apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert _sum_penalties(ctx) <= 1e-8
 
 
-def test_multiple_conflicts_sum_over_days_and_workers():
+def test_multiple_conflicts_sum_over_days_and_workers(lp_solver):
     # 複数 worker と複数日の衝突は独立に加算
     # Alice: d1 NIGHT -> d2 DAY -> 1件
     # Bob: d2 NIGHT -> d3 AM -> 1件
@@ -143,12 +143,12 @@ def test_multiple_conflicts_sum_over_days_and_workers():
     SoftNoDutyAfterNight(weight=weight).apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert abs(_sum_penalties(ctx) - 2 * weight) <= 1e-8
 
 
-def test_or_logic_single_penalty_even_if_multiple_next_day_assignments():
+def test_or_logic_single_penalty_even_if_multiple_next_day_assignments(lp_solver):
     # 翌日に複数の DAY or AM があっても OR 集約のためペナルティは 1 件のみ
     d1 = dt.date(2025, 6, 10)
     d2 = dt.date(2025, 6, 11)
@@ -166,6 +166,6 @@ def test_or_logic_single_penalty_even_if_multiple_next_day_assignments():
     SoftNoDutyAfterNight(weight=weight).apply(m, x, ctx)
     set_objective_with_penalties(m, pulp.lpSum(x.values()), ctx)
 
-    status = m.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = m.solve(lp_solver)
     assert pulp.LpStatus[status] == "Optimal"
     assert abs(_sum_penalties(ctx) - weight) <= 1e-8
@@ -1,6 +1,4 @@
 import datetime as dt
-import importlib
-import sys
 
 import pulp
 import pytest
@@ -14,8 +12,6 @@ def _reset_registry_and_module():
     import src.constraints.base as base
 
     base.constraint_registry.clear()
-    sys.modules.pop("src.constraints.c01_one_person_per_hospital", None)
-    importlib.invalidate_caches()
 
 
 @pytest.fixture(autouse=True)
@@ -25,9 +21,9 @@ def _clean():
     _reset_registry_and_module()
 
 
-def test_solve_result_contains_slack_info():
+def test_solve_result_contains_slack_info(register_plugin):
     """SolveResultにスラック変数の情報が含まれることをテスト"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
 
     # テスト用のモデル設定
     h = "大学"
@@ -70,9 +66,9 @@ def test_solve_result_contains_slack_info():
     assert result.shortage_slack[(h, d)] == 1.0
 
 
-def test_solve_result_no_shortage():
+def test_solve_result_no_shortage(register_plugin):
     """人手不足がない場合のテスト"""
-    import src.constraints.c01_one_person_per_hospital  # noqa: F401
+    register_plugin("src.constraints.c01_one_person_per_hospital")
 
     h = "大学"
     d = dt.date(2025, 10, 9)
@@ -110,3 +106,95 @@ def test_solve_result_no_shortage():
     assert result.is_shortage is False
     assert result.total_shortage == 0.0
     assert len(result.shortage_slack) == 0
+
+
+def _warm_start_problem():
+    """1病院1日・候補1人の最小モデル(目的はスラック最小化)"""
+    h = "大学"
+    d = dt.date(2025, 10, 9)
+    key = (h, "診断01", d, "NIGHT")
+    x = {key: pulp.LpVariable("x1", 0, 1, cat="Binary")}
+
+    model = pulp.LpProblem("warm_start_test", pulp.LpMinimize)
+    ctx = Context(
+        hospitals=[],
+        workers=[],
+        days=[d],
+        specified_days={},
+        preferences=[],
+        max_assignments={},
+        required_hd={(h, d)},
+        variables=x,
+    )
+    OnePersonPerHospital().apply(model, x, ctx)
+    model += pulp.lpSum(ctx.get("shortage_slack", {}).values())
+    return model, x, ctx, key
+
+
+@pytest.fixture
+def cbc_calls(monkeypatch):
+    """solve() が作る既定の CBC コマンドの引数と、その時点の初期値を記録する"""
+    calls = []
+    real_cbc = pulp.PULP_CBC_CMD
+
+    def _spy(**kwargs):
+        calls.append(kwargs)
+        return real_cbc(**kwargs)
+
+    monkeypatch.setattr(pulp, "PULP_CBC_CMD", _spy)
+    return calls
+
+
+def test_solve_sets_initial_values_and_enables_warm_start(register_plugin, cbc_calls):
+    """前回の割当を渡すと、一致する変数に初期値を設定して warmStart 付きで CBC を起動する"""
+    register_plugin("src.constraints.c01_one_person_per_hospital")
+    model, x, ctx, key = _warm_start_problem()
+
+    set_values = []
+    set_initial = pulp.LpVariable.setInitialValue
+
+    def _record(var, val, check=True):
+        set_values.append((var.name, val))
+        return set_initial(var, val, check)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(pulp.LpVariable, "setInitialValue", _record)
+        result = solve(model, x, ctx, build_objective=False, initial_assignment={key: 1})
+
+    assert set_values == [("x1", 1)]
+    assert len(cbc_calls) == 1
+    assert cbc_calls[0]["warmStart"] is True
+
+    # 初期解を渡しても同じ最適解が得られる
+    assert result.status == "Optimal"
+    assert result.assignment[key] == 1
+    assert result.is_shortage is False
+
+
+@pytest.mark.parametrize("initial_assignment", [None, {}, {("他院", "診断99", None, "DAY"): 1}])
+def test_solve_keeps_warm_start_off_without_matching_keys(
+    register_plugin, cbc_calls, initial_assignment
+):
+    """初期解が無い、または一致するキーが無いときは warmStart を付けない"""
+    register_plugin("src.constraints.c01_one_person_per_hospital")
+    model, x, ctx, key = _warm_start_problem()
+
+    result = solve(model, x, ctx, build_objective=False, initial_assignment=initial_assignment)
+
+    assert len(cbc_calls) == 1
+    assert cbc_calls[0]["warmStart"] is False
+    assert result.assignment[key] == 1
+
+
+def test_solve_skips_initial_values_outside_bounds(register_plugin, cbc_calls):
+    """希望で禁止されて upBound=0 になった変数に前回の 1 を渡しても、解けて初期値は無視される"""
+    register_plugin("src.constraints.c01_one_person_per_hospital")
+    model, x, ctx, key = _warm_start_problem()
+    x[key].upBound = 0
+
+    result = solve(model, x, ctx, build_objective=False, initial_assignment={key: 1})
+
+    assert cbc_calls[0]["warmStart"] is False
+    assert result.status == "Optimal"
+    assert result.assignment[key] == 0
+    assert result.is_shortage is True
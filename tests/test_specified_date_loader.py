@@ -91,3 +91,29 @@ def test_duplicate_names_last_wins(tmp_path):
     got = load_specified_days(str(path))
     # 後勝ち(辞書上書き)
     assert got == {"F病院": [2, 3]}
+
+
+def test_reload_picks_up_changes_and_results_are_independent(tmp_path):
+    path = write_toml(
+        tmp_path,
+        """
+        [[hospitals]]
+        name = "A病院"
+        dates = [1, 5]
+        """,
+    )
+    first = load_specified_days(str(path))
+    # 返り値を書き換えても次回の読み込みには影響しない
+    first["A病院"].append(99)
+    assert load_specified_days(str(path)) == {"A病院": [1, 5]}
+
+    # ファイルが更新されたら読み直す
+    write_toml(
+        tmp_path,
+        """
+        [[hospitals]]
+        name = "A病院"
+        dates = [1, 5, 12, 30]
+        """,
+    )
+    assert load_specified_days(str(path)) == {"A病院": [1, 5, 12, 30]}
@@ -175,7 +175,6 @@ def test_validate_required_ok_when_candidates_exist(monkeypatch):
     w = _mk_worker("山田", "D病院", weekdays=[Weekday.MONDAY], shift_type=ShiftType.DAY)
 
     vb = VariableBuilder([h], [w], generate_monthly_dates(y, m))
-    vb.init_all_zero()
     vb.elevate_by_workers([w])
     vb.restrict_by_hospitals([h], specified_days={})
 
@@ -205,7 +204,6 @@ def test_validate_required_raises_when_no_candidates(monkeypatch):
     w = _mk_worker("佐藤", "E病院", weekdays=[Weekday.TUESDAY], shift_type=ShiftType.DAY)
 
     vb = VariableBuilder([h], [w], generate_monthly_dates(y, m))
-    vb.init_all_zero()
     vb.elevate_by_workers([w])  # 火曜の候補は立つ
     vb.restrict_by_hospitals([h], {})  # 需要は月曜→候補0の日が生じる
 
@@ -0,0 +1,55 @@
+import datetime as dt
+
+import pulp
+
+from src.domain.context import build_var_index, ensure_day_index, ensure_var_index
+from src.domain.types import ShiftType
+
+
+def _make_x():
+    d1, d2 = dt.date(2025, 10, 1), dt.date(2025, 10, 2)
+    x = {
+        ("A", "w1", d1, ShiftType.DAY): pulp.LpVariable("a_w1_d1_day", 0, 1, cat="Binary"),
+        ("A", "w1", d2, ShiftType.NIGHT): pulp.LpVariable("a_w1_d2_night", 0, 1, cat="Binary"),
+        ("B", "w1", d1, ShiftType.AM): pulp.LpVariable("b_w1_d1_am", 0, 1, cat="Binary"),
+        ("A", "w2", d1, ShiftType.DAY): pulp.LpVariable("a_w2_d1_day", 0, 1, cat="Binary"),
+    }
+    return x, d1, d2
+
+
+def test_build_var_index_groups_by_each_key():
+    x, d1, d2 = _make_x()
+    ctx = {}
+    build_var_index(ctx, x)
+
+    assert ctx["by_hd"][("A", d1)] == [
+        x[("A", "w1", d1, ShiftType.DAY)],
+        x[("A", "w2", d1, ShiftType.DAY)],
+    ]
+    assert ctx["by_wd"][("w1", d1)] == [
+        ("A", ShiftType.DAY, x[("A", "w1", d1, ShiftType.DAY)]),
+        ("B", ShiftType.AM, x[("B", "w1", d1, ShiftType.AM)]),
+    ]
+    assert len(ctx["by_wh"][("w1", "A")]) == 2
+    assert ctx["by_wds"][("w1", d2, ShiftType.NIGHT)] == [x[("A", "w1", d2, ShiftType.NIGHT)]]
+    # 変数が無い組は索引に現れない
+    assert ("B", d2) not in ctx["by_hd"]
+
+
+def test_ensure_var_index_keeps_existing_index():
+    x, _, _ = _make_x()
+    ctx = {}
+    build_var_index(ctx, x)
+    by_hd = ctx["by_hd"]
+
+    ensure_var_index(ctx, {})
+    assert ctx["by_hd"] is by_hd
+
+
+def test_ensure_day_index_sorts_once_and_maps_positions():
+    d1, d2, d3 = dt.date(2025, 10, 1), dt.date(2025, 10, 2), dt.date(2025, 10, 3)
+    ctx = {"days": [d3, d1, d2]}
+    ensure_day_index(ctx)
+
+    assert ctx["days_sorted"] == [d1, d2, d3]
+    assert ctx["day_to_idx"] == {d1: 0, d2: 1, d3: 2}
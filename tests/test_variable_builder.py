@@ -80,7 +80,6 @@ def test_weekly_day_required_only_on_listed_weekdays(monkeypatch):
     days = generate_monthly_dates(y, m)
 
     vb = VariableBuilder([h], [w], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w])
     vb.restrict_by_hospitals([h], specified_days={})
 
@@ -118,7 +117,6 @@ def test_biweekly_skips_alternate_weeks(monkeypatch):
     )
 
     vb = VariableBuilder([h], [w], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w])
     vb.restrict_by_hospitals([h], specified_days={})
 
@@ -152,7 +150,6 @@ def test_specific_days(monkeypatch):
     specified = {"C病院": [12, 15]}  # 12日と15日が要求日
 
     vb = VariableBuilder([h], [w], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w])
     vb.restrict_by_hospitals([h], specified_days=specified)
 
@@ -199,7 +196,6 @@ def test_public_holiday_exclusion_for_non_night(monkeypatch):
     )
 
     vb = VariableBuilder([h], [w_day, w_nig], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w_day, w_nig])
     vb.restrict_by_hospitals([h], specified_days={})
 
@@ -243,7 +239,6 @@ def test_materialize_creates_only_ub1_and_variable_name(monkeypatch):
     )
 
     vb = VariableBuilder([h], [w], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w])
     vb.restrict_by_hospitals([h], specified_days={})
 
@@ -291,7 +286,6 @@ def test_filter_by_max_assignments_basic_functionality(monkeypatch):
     )
 
     vb = VariableBuilder([h1], [w1, w2], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w1, w2])
     vb.restrict_by_hospitals([h1], specified_days={})
 
@@ -361,7 +355,6 @@ def test_filter_by_max_assignments_multiple_hospitals(monkeypatch):
     )
 
     vb = VariableBuilder([h1, h2], [w1], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w1])
     vb.restrict_by_hospitals([h1, h2], specified_days={})
 
@@ -432,7 +425,6 @@ def test_filter_by_max_assignments_all_shift_types(monkeypatch):
     )
 
     vb = VariableBuilder([h1], [w1], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w1])
     vb.restrict_by_hospitals([h1], specified_days={})
 
@@ -474,7 +466,6 @@ def test_filter_by_max_assignments_edge_cases(monkeypatch):
     )
 
     vb = VariableBuilder([h1], [w1], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w1])
     vb.restrict_by_hospitals([h1], specified_days={})
 
@@ -503,7 +494,7 @@ def test_filter_by_max_assignments_edge_cases(monkeypatch):
 def test_filter_by_max_assignments_integration_workflow(monkeypatch):
     """
     完全なワークフローでのintegrationテスト:
-    init_all_zero → elevate_by_workers
+    elevate_by_workers
     → restrict_by_hospitals
     → filter_by_max_assignments
     → materialize
@@ -534,13 +525,10 @@ def test_filter_by_max_assignments_integration_workflow(monkeypatch):
 
     vb = VariableBuilder([h1], [w1, w2], days)
 
-    # 1. 全て0で初期化
-    vb.init_all_zero()
-
-    # 2. 医師の勤務可能性でUBを1に
+    # 1. 医師の勤務可能性でUBを1に(未登録のキーは UB=0)
     vb.elevate_by_workers([w1, w2])
 
-    # 3. 病院の需要で不要な変数をUB=0に
+    # 2. 病院の需要で不要な変数をUB=0に
     vb.restrict_by_hospitals([h1], specified_days={})
 
     # この時点で両医師とも月・火のDAYで勤務可能
@@ -551,7 +539,7 @@ def test_filter_by_max_assignments_integration_workflow(monkeypatch):
         assert vb.ub[(h1.name, w1.name, d, ShiftType.DAY)] == 1
         assert vb.ub[(h1.name, w2.name, d, ShiftType.DAY)] == 1
 
-    # 4. max_assignmentsで医師Aを病院1から除外
+    # 3. max_assignmentsで医師Aを病院1から除外
     max_assignments = {("医師A", "病院1"): 0}
     vb.filter_by_max_assignments(max_assignments)
 
@@ -563,7 +551,7 @@ def test_filter_by_max_assignments_integration_workflow(monkeypatch):
     for d in mondays_tuesdays:
         assert vb.ub[(h1.name, w2.name, d, ShiftType.DAY)] == 1
 
-    # 5. 変数として具現化
+    # 4. 変数として具現化
     variables = vb.materialize(name="test_var")
 
     # 医師Aの変数は1つもない
@@ -622,7 +610,6 @@ def test_filter_by_max_assignments_partial_restriction(monkeypatch):
     )
 
     vb = VariableBuilder([h1, h2], [w1, w2, w3], days)
-    vb.init_all_zero()
     vb.elevate_by_workers([w1, w2, w3])
     vb.restrict_by_hospitals([h1, h2], specified_days={})
 
@@ -648,3 +635,92 @@ def test_filter_by_max_assignments_partial_restriction(monkeypatch):
     # 医師C: 病院1は1、病院2は0(病院2に割り当てられていない)
     assert vb.ub[(h1.name, w3.name, test_day, ShiftType.DAY)] == 1
     assert vb.ub[(h2.name, w3.name, test_day, ShiftType.DAY)] == 0
+
+
+def test_required_map_is_reused_for_same_inputs(monkeypatch):
+    """restrict_by_hospitals で求めた需要マップを、同じ入力なら再計算せず使い回す"""
+    monkeypatch.setattr("src.model.demand.is_public_holiday", lambda d: False)
+
+    days = generate_monthly_dates(2025, 8)
+    w = make_worker("高橋一郎", "C病院", weekdays=list(Weekday), shift_type=ShiftType.NIGHT)
+    h = make_hospital(
+        "C病院",
+        rules=[
+            HospitalDemandRule(
+                shift_type=ShiftType.NIGHT,
+                weekdays=[],
+                frequency=Frequency.SPECIFIC_DAYS,
+            )
+        ],
+    )
+    hospitals = [h]
+    specified = {"C病院": [12, 15]}
+
+    calls = []
+    import src.model.variable_builder as vb_mod
+
+    orig = vb_mod.compute_required_map
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return orig(*args, **kwargs)
+
+    monkeypatch.setattr(vb_mod, "compute_required_map", counting)
+
+    vb = VariableBuilder(hospitals, [w], days)
+    vb.elevate_by_workers([w])
+    vb.restrict_by_hospitals(hospitals, specified_days=specified)
+    required = vb.required_map_for(hospitals, specified)
+
+    assert len(calls) == 1
+    assert set(required) == {("C病院", dt.date(2025, 8, 12)), ("C病院", dt.date(2025, 8, 15))}
+
+    # 入力が変われば計算し直す
+    other = {"C病院": [1]}
+    assert set(vb.required_map_for(hospitals, other)) == {("C病院", dt.date(2025, 8, 1))}
+    assert len(calls) == 2
+
+
+def test_cand_by_hd_tracks_ub_updates(monkeypatch):
+    """cand_by_hd は (h,d) ごとの UB=1 の件数と常に一致する"""
+    monkeypatch.setattr("src.model.demand.is_public_holiday", lambda d: False)
+
+    days = generate_monthly_dates(2025, 9)
+    w1 = make_worker("医師A", "病院1", weekdays=[Weekday.MONDAY], shift_type=ShiftType.DAY)
+    w2 = make_worker(
+        "医師B", "病院1", weekdays=[Weekday.MONDAY, Weekday.FRIDAY], shift_type=ShiftType.DAY
+    )
+    h1 = make_hospital(
+        "病院1",
+        rules=[
+            HospitalDemandRule(
+                shift_type=ShiftType.DAY,
+                weekdays=[Weekday.MONDAY],
+                frequency=Frequency.WEEKLY,
+            )
+        ],
+    )
+
+    def expected(vb):
+        counts = {}
+        for (h, _w, d, _s), ub in vb.ub.items():
+            if ub == 1:
+                counts[(h, d)] = counts.get((h, d), 0) + 1
+        return counts
+
+    def actual(vb):
+        return {hd: n for hd, n in vb.cand_by_hd.items() if n}
+
+    vb = VariableBuilder([h1], [w1, w2], days)
+    # 同じ割当を二重に渡しても数え直さない
+    vb.elevate_by_workers([w1, w2, w1])
+    assert actual(vb) == expected(vb)
+
+    vb.restrict_by_hospitals([h1], specified_days={})
+    assert actual(vb) == expected(vb)
+    monday = find_first_weekday(days, 0)
+    assert vb.cand_by_hd[("病院1", monday)] == 2
+
+    vb.filter_by_max_assignments({("医師A", "病院1"): 0})
+    assert actual(vb) == expected(vb)
+    assert vb.cand_by_hd[("病院1", monday)] == 1